@@ -1,7 +1,12 @@
+import ast
+import os
+
+
 class Constants:
-    fan_content_interaction_df=None
-    fan_favourites_df=None
-    teams=None
-    players=None
-    
-    CONFIG_LIST=[{}]
\ No newline at end of file
+    CONFIG_LIST=None
+
+    def get_config_list():
+        """Parses CONFIG_LIST from the environment the first time an agent needs it."""
+        if Constants.CONFIG_LIST is None:
+            Constants.CONFIG_LIST=ast.literal_eval(os.getenv("CONFIG_LIST", "[{}]"))
+        return Constants.CONFIG_LIST
@@ -0,0 +1,27 @@
+import time
+
+from Utils.Utils import Utils
+from Utils.DomainModels import Catalog, Player, Team
+
+
+class DataLoader:
+    mlb_fan_content_interaction_file = 'https://storage.googleapis.com/gcp-mlb-hackathon-2025/datasets/mlb-fan-content-interaction-data/mlb-fan-content-interaction-data-000000000000.json'
+    mlb_fan_favorites_json_file = 'https://storage.googleapis.com/gcp-mlb-hackathon-2025/datasets/mlb-fan-content-interaction-data/2025-mlb-fan-favs-follows.json'
+    teams_endpoint_url = 'https://statsapi.mlb.com/api/v1/teams?sportId=1'
+
+    def load_datasets():
+        """
+        Loads the MLB fan datasets along with the teams and current season players.
+
+        Returns:
+            A dict keyed by the ``DatasetSnapshot`` attribute each dataset is served from.
+        """
+        single_season_players_url = f'https://statsapi.mlb.com/api/v1/sports/1/players?season={time.strftime("%Y")}'
+
+        datasets = {}
+        datasets["fan_content_interaction_df"] = Utils.load_newline_delimited_json(DataLoader.mlb_fan_content_interaction_file, date_columns=["date_time_date"])
+        datasets["fan_favourites_df"] = Utils.load_newline_delimited_json(DataLoader.mlb_fan_favorites_json_file)
+        # Only the fields the domain records keep, not every column json_normalize would produce
+        datasets["teams"] = Catalog.from_api(Team, Utils.fetch_data(DataLoader.teams_endpoint_url).get("teams", [])).to_frame()
+        datasets["players"] = Catalog.from_api(Player, Utils.fetch_data(single_season_players_url).get("people", [])).to_frame()
+        return datasets
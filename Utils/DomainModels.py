@@ -0,0 +1,120 @@
+import json
+
+from Utils.StatsStore import StatsStore
+from Utils.Startup import LazyModule
+
+pd = LazyModule("pandas")
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
+
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class Record:
+    """
+    Base for the compact domain records.
+
+    Subclasses list the fields they keep in ``__slots__``; everything else in the Stats
+    API payload is dropped. Kept fields have the same names and shapes as upstream, so
+    nested objects stay nested. The JSON form is rendered once, when the record is built.
+
+    ``flattened`` maps the flat columns used by the frames and prompt context to the
+    (nested field, key) they are read from.
+    """
+
+    __slots__ = ("json",)
+    flattened = {}
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in type(self).fields}
+
+    def to_row(self) -> dict:
+        """Flat form for frames: each nested field becomes the columns it is read into."""
+        row = self.to_dict()
+        nested = {field: row.pop(field, None) or {} for field, _ in type(self).flattened.values()}
+        row.update({column: nested[field].get(key) for column, (field, key) in type(self).flattened.items()})
+        return row
+
+    def _freeze(self):
+        self.json = dumps(self.to_dict())
+        return self
+
+
+class Player(Record):
+    fields = ("id", "fullName", "nameFirstLast", "firstName", "lastName", "primaryNumber", "birthDate",
+              "currentAge", "height", "weight", "active", "currentTeam", "primaryPosition", "batSide", "pitchHand")
+    __slots__ = fields
+    flattened = {"currentTeamId": ("currentTeam", "id"), "primaryPosition": ("primaryPosition", "abbreviation"),
+                 "batSide": ("batSide", "code"), "pitchHand": ("pitchHand", "code")}
+
+    def from_api(data: dict) -> "Player":
+        player = Player()
+        for field in Player.fields:
+            setattr(player, field, data.get(field))
+        player.nameFirstLast = data.get("nameFirstLast") or data.get("fullName")
+        return player._freeze()
+
+
+class Team(Record):
+    fields = ("id", "name", "teamName", "abbreviation", "locationName", "clubName", "franchiseName",
+              "firstYearOfPlay", "active", "sport", "league", "division", "venue")
+    __slots__ = fields
+    flattened = {"sportId": ("sport", "id"), "leagueId": ("league", "id"), "divisionId": ("division", "id"),
+                 "venueName": ("venue", "name")}
+
+    def from_api(data: dict) -> "Team":
+        team = Team()
+        for field in Team.fields:
+            setattr(team, field, data.get(field))
+        return team._freeze()
+
+
+class Catalog:
+    """An ordered, id-indexed collection of records with the whole list pre-serialized."""
+
+    __slots__ = ("record_type", "records", "by_id", "json", "content_hash")
+
+    def __init__(self, record_type, records, content_hash=None):
+        self.record_type = record_type
+        self.records = tuple(records)
+        self.by_id = {record.id: record for record in self.records}
+        self.json = b"[" + b",".join(record.json for record in self.records) + b"]"
+        self.content_hash = content_hash
+
+    def from_api(record_type, items: list, content_hash=None) -> "Catalog":
+        return Catalog(record_type, [record_type.from_api(item) for item in items], content_hash)
+
+    def get(self, record_id):
+        return self.by_id.get(record_id)
+
+    def to_frame(self) -> "pd.DataFrame":
+        """One flat column per kept field, instead of the hundreds json_normalize produces."""
+        record_type = self.record_type
+        nested = {field for field, _ in record_type.flattened.values()}
+        columns = [field for field in record_type.fields if field not in nested] + list(record_type.flattened)
+        return pd.DataFrame.from_records([record.to_row() for record in self.records], columns=columns)
+
+
+class Catalogs:
+    """
+    Catalogs built from the local Stats API mirror, rebuilt only when the mirrored
+    content changes. The hot League routes return their ``json`` bytes as-is.
+    """
+
+    _catalogs = {}
+
+    def get(kind: str, record_type, **params) -> Catalog:
+        scope = StatsStore.refresh(kind, **params)
+        content_hash = StatsStore.content_hash(kind, scope)
+        catalog = Catalogs._catalogs.get((kind, scope))
+        if catalog is None or catalog.content_hash != content_hash:
+            catalog = Catalog.from_api(record_type, StatsStore.read(kind, scope), content_hash)
+            Catalogs._catalogs[(kind, scope)] = catalog
+        return catalog
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+
+class IdLookup:
+    """
+    Vectorized id -> row lookup over a frame, built once when a snapshot is derived.
+
+    When the ids are small enough, positions live in a dense array indexed by id.
+    Otherwise the ids are kept sorted and resolved with ``searchsorted``. Either way,
+    enriching a whole id column is one array gather, with no per-request merge.
+    """
+
+    # Largest id for which the dense table is used (4 bytes per slot)
+    max_dense_id = 1 << 22
+
+    def __init__(self, ids, columns: dict):
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.arange(len(ids), dtype=np.int32)
+        # the extra trailing slot in every column holds None and serves missing ids
+        self.columns = {name: np.append(np.asarray(values, dtype=object), None) for name, values in columns.items()}
+        self.missing = len(ids)
+
+        if len(ids) and ids.min() >= 0 and ids.max() < IdLookup.max_dense_id:
+            self.dense = np.full(ids.max() + 1, self.missing, dtype=np.int32)
+            self.dense[ids] = positions
+            self.sorted_ids = self.sorted_positions = None
+        else:
+            self.dense = None
+            order = np.argsort(ids, kind="stable")
+            self.sorted_ids = ids[order]
+            self.sorted_positions = positions[order]
+
+    def from_frame(frame: pd.DataFrame, id_column: str = "id") -> "IdLookup":
+        frame = frame[frame[id_column].notna()].drop_duplicates(id_column)
+        return IdLookup(frame[id_column].astype(np.int64).to_numpy(),
+                        {column: frame[column].to_numpy() for column in frame.columns})
+
+    def positions(self, ids) -> np.ndarray:
+        """Row position of every id, or ``self.missing`` for ids that are not known."""
+        if isinstance(ids, (pd.Series, pd.Index)):
+            ids = ids.to_numpy(dtype=np.int64, na_value=-1)
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        result = np.full(ids.shape, self.missing, dtype=np.int32)
+        if self.dense is not None:
+            known = (ids >= 0) & (ids < len(self.dense))
+            result[known] = self.dense[ids[known]]
+        elif len(self.sorted_ids):
+            index = np.minimum(np.searchsorted(self.sorted_ids, ids), len(self.sorted_ids) - 1)
+            found = self.sorted_ids[index] == ids
+            result[found] = self.sorted_positions[index[found]]
+        return result
+
+    def gather(self, ids, column: str) -> np.ndarray:
+        """``column`` for every id in one vectorized gather; None where the id is unknown."""
+        return self.columns[column][self.positions(ids)]
+
+    def row(self, record_id) -> dict:
+        """All known, non-missing fields of a single id, or None."""
+        position = self.positions([record_id])[0]
+        if position == self.missing:
+            return None
+        return {name: values[position] for name, values in self.columns.items()
+                if values[position] is not None and values[position] == values[position]}
@@ -0,0 +1,201 @@
+import asyncio
+import json
+
+
+class RouteClass:
+    """
+    Concurrency budget for one class of routes.
+
+    Args:
+        name: Class name reported in the gauges.
+        max_concurrency: Requests of this class allowed to run at once.
+        max_queue: Requests allowed to wait for a slot; any more are shed straight away.
+        queue_timeout: Seconds a request may wait for a slot before it is shed.
+        deadline: Seconds a running request gets before the client receives a 504.
+        retry_after: Seconds suggested to shed clients in the Retry-After header.
+    """
+
+    def __init__(self, name, max_concurrency, max_queue, queue_timeout, deadline, retry_after):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.deadline = deadline
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.queued = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.completed = 0
+        self._semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def gauges(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "deadline_seconds": self.deadline,
+            "shed_total": self.shed,
+            "timed_out_total": self.timed_out,
+            "completed_total": self.completed,
+        }
+
+
+# Every def handler runs on AnyIO's shared threadpool and a handler past its deadline
+# keeps its thread until it finishes, so the limits together must fit in that pool:
+# configure_threadpool sizes it to their sum plus CONTROL_THREADS for unlimited routes.
+ROUTE_CLASSES = {
+    "catalog": RouteClass("catalog", max_concurrency=24, max_queue=64, queue_timeout=2, deadline=15, retry_after=1),
+    "media": RouteClass("media", max_concurrency=8, max_queue=16, queue_timeout=2, deadline=15, retry_after=2),
+    "analytics": RouteClass("analytics", max_concurrency=8, max_queue=16, queue_timeout=5, deadline=30, retry_after=5),
+    "generation": RouteClass("generation", max_concurrency=4, max_queue=8, queue_timeout=10, deadline=660, retry_after=30),
+    "agent": RouteClass("agent", max_concurrency=4, max_queue=8, queue_timeout=10, deadline=300, retry_after=30),
+}
+CONTROL_THREADS = 8
+
+# Upstream image proxies, e.g. /team/{id}/logo; checked before the prefixes
+ROUTE_SUFFIXES = [
+    (("/logo", "/headshot"), "media"),
+]
+
+# Checked in order, first prefix wins; paths matching none of them are catalog routes
+ROUTE_PREFIXES = [
+    (("/ready", "/admin", "/docs", "/redoc", "/openapi.json"), None),
+    (("/answer",), "agent"),
+    (("/extract/clips", "/product/recommendations", "/generate/", "/upload-files", "/delete/", "/files/"), "generation"),
+    (("/most-followed-", "/top-interacted-content", "/memory-report", "/generate-content-link"), "analytics"),
+]
+
+
+def classify(path: str) -> RouteClass:
+    """The RouteClass governing ``path``, or None for control routes that are never limited."""
+    for suffixes, name in ROUTE_SUFFIXES:
+        if path.rstrip("/").endswith(suffixes):
+            return ROUTE_CLASSES[name]
+    for prefixes, name in ROUTE_PREFIXES:
+        if path.startswith(prefixes):
+            return ROUTE_CLASSES[name] if name else None
+    return ROUTE_CLASSES["catalog"]
+
+
+async def _acquire(semaphore: asyncio.Semaphore, timeout: float) -> bool:
+    """
+    Waits up to ``timeout`` seconds for a permit and reports whether one was taken.
+
+    ``asyncio.wait_for`` can raise TimeoutError after the acquire already succeeded,
+    leaking the permit for good; here a permit granted as the wait gives up is handed
+    straight back.
+    """
+    acquire = asyncio.ensure_future(semaphore.acquire())
+    try:
+        await asyncio.wait({acquire}, timeout=timeout)
+    finally:
+        if not acquire.done():
+            acquire.cancel()
+            acquire.add_done_callback(lambda task: task.cancelled() or semaphore.release())
+    return acquire.done() and not acquire.cancelled()
+
+
+async def _send_json(send, status: int, content: dict, headers=()):
+    body = json.dumps(content).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())] + list(headers),
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class LoadSheddingMiddleware:
+    """
+    ASGI middleware that gives every route class its own concurrency limit and deadline.
+
+    A saturated class answers 503 with Retry-After right away instead of queueing work
+    behind slow requests, so slow agent or generation traffic cannot starve cheap
+    catalog routes. A request past its deadline gets a 504 straight away; its handler
+    keeps its slot until it actually finishes, since a threadpool handler cannot be
+    interrupted. Deadlines and the other classes only keep running while handlers leave
+    the event loop free, so blocking work belongs in ``def`` handlers or
+    ``asyncio.to_thread``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        route_class = classify(scope["path"]) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = [(b"retry-after", str(route_class.retry_after).encode())]
+        if route_class.semaphore.locked() and route_class.queued >= route_class.max_queue:
+            route_class.shed += 1
+            await _send_json(send, 503, {"detail": f"Too many {route_class.name} requests, retry later"}, retry_after)
+            return
+
+        route_class.queued += 1
+        try:
+            acquired = await _acquire(route_class.semaphore, route_class.queue_timeout)
+        finally:
+            route_class.queued -= 1
+        if not acquired:
+            route_class.shed += 1
+            await _send_json(send, 503, {"detail": f"Too many {route_class.name} requests, retry later"}, retry_after)
+            return
+
+        route_class.in_flight += 1
+        state = {"started": False, "abandoned": False}
+
+        async def guarded_send(message):
+            if state["abandoned"]:
+                return
+            if message["type"] == "http.response.start":
+                state["started"] = True
+            await send(message)
+
+        def release(task):
+            route_class.in_flight -= 1
+            route_class.completed += 1
+            route_class.semaphore.release()
+            if state["abandoned"] and not task.cancelled():
+                # nobody awaits an abandoned handler; retrieve its error so it is not reported as lost
+                task.exception()
+
+        task = asyncio.ensure_future(self.app(scope, receive, guarded_send))
+        task.add_done_callback(release)
+        done, _ = await asyncio.wait({task}, timeout=route_class.deadline)
+        if task in done:
+            task.result()
+            return
+
+        route_class.timed_out += 1
+        if state["started"]:
+            # A response already streaming is finished rather than cut off mid-body
+            await task
+            return
+        # The handler is left to finish rather than cancelled: cancelling frees the slot
+        # while its threadpool worker keeps running, which would hide the real load
+        state["abandoned"] = True
+        await _send_json(send, 504, {"detail": f"The {route_class.name} request exceeded its {route_class.deadline}s deadline"})
+
+
+class LoadShedding:
+    def gauges() -> dict:
+        return {name: route_class.gauges() for name, route_class in ROUTE_CLASSES.items()}
+
+    def threadpool_size() -> int:
+        return sum(route_class.max_concurrency for route_class in ROUTE_CLASSES.values()) + CONTROL_THREADS
+
+    def configure_threadpool():
+        """Sizes AnyIO's default thread limiter; must run on the server's event loop."""
+        import anyio.to_thread
+
+        anyio.to_thread.current_default_thread_limiter().total_tokens = LoadShedding.threadpool_size()
@@ -0,0 +1,118 @@
+import asyncio
+from functools import lru_cache
+
+from fastapi import HTTPException
+
+import config
+from Utils.DomainModels import Catalogs, Player, Team
+from Utils.Snapshot import Snapshots
+from Utils.StatsStore import StatsStore
+
+
+def _current_snapshot():
+    try:
+        return Snapshots.current()
+    except HTTPException:
+        return None
+
+
+def _team(team_id: int, snapshot):
+    team = snapshot.team_lookup.row(team_id) if snapshot and snapshot.team_lookup else None
+    if team is None:
+        record = Catalogs.get("teams", Team).get(team_id)
+        team = record.to_row() if record else None
+    return team
+
+
+# Keyed by the snapshot itself, so a block always matches the data it was rendered from;
+# PromptContext empties the caches when a new snapshot is published.
+@lru_cache(maxsize=4096)
+def _render_player(player_id: int, snapshot) -> str:
+    player = snapshot.player_lookup.row(player_id) if snapshot and snapshot.player_lookup else None
+    if player is None:
+        person = StatsStore.get_person(player_id)
+        player = Player.from_api(person).to_row() if person else None
+    if player is None:
+        return None
+
+    details = [f"Player context: {player.get('fullName') or player.get('nameFirstLast')} (player id {player_id})"]
+    if player.get("primaryPosition"):
+        details.append(f"position {player['primaryPosition']}")
+    if player.get("primaryNumber"):
+        details.append(f"number {player['primaryNumber']}")
+    if player.get("batSide") and player.get("pitchHand"):
+        details.append(f"bats {player['batSide']} / throws {player['pitchHand']}")
+    if player.get("birthDate"):
+        details.append(f"born {player['birthDate']}")
+    if player.get("height") and player.get("weight"):
+        details.append(f"{player['height']}, {player['weight']} lb")
+    team_id = player.get("currentTeamId")
+    if team_id:
+        try:
+            team = _team(int(team_id), snapshot)
+        except HTTPException as e:
+            print(f"Could not look up team {team_id} for player {player_id}: {e.detail}")
+            team = None
+        details.append(f"plays for {team['name'] if team else f'team {int(team_id)}'}")
+    details.append(f"headshot: {config.BASE_HEADSHOT_URL}/{player_id}.jpg")
+    return ", ".join(details) + "."
+
+
+@lru_cache(maxsize=1024)
+def _render_team(team_id: int, snapshot) -> str:
+    team = _team(team_id, snapshot)
+    if team is None:
+        return None
+
+    details = [f"Team context: {team['name']} (team id {team_id})"]
+    if team.get("abbreviation"):
+        details.append(f"abbreviation {team['abbreviation']}")
+    if team.get("locationName"):
+        details.append(f"based in {team['locationName']}")
+    if team.get("venueName"):
+        details.append(f"home venue {team['venueName']}")
+    if team.get("firstYearOfPlay"):
+        details.append(f"first year of play {team['firstYearOfPlay']}")
+    details.append(f"logo: {config.BASE_LOGO_URL}/{team_id}.svg")
+    return ", ".join(details) + "."
+
+
+class PromptContext:
+    """
+    Player and team context blocks injected into generation prompts.
+
+    Blocks are rendered from the preloaded snapshot frames, falling back to the local
+    Stats API mirror, and memoized per id for the lifetime of a snapshot. Context is
+    best-effort: a block that cannot be looked up is left out of the prompt.
+    """
+
+    _cached_version = None
+
+    def _snapshot():
+        snapshot = _current_snapshot()
+        version = snapshot.version if snapshot else None
+        if version != PromptContext._cached_version:
+            # drop the blocks (and the reference) of the previous snapshot
+            _render_player.cache_clear()
+            _render_team.cache_clear()
+            PromptContext._cached_version = version
+        return snapshot
+
+    def player(player_id) -> str:
+        return _render_player(int(player_id), PromptContext._snapshot())
+
+    def team(team_id) -> str:
+        return _render_team(int(team_id), PromptContext._snapshot())
+
+    async def resolve(player_id=None, team_id=None) -> list:
+        """Renders the requested context blocks concurrently, off the event loop."""
+        lookups = []
+        if player_id:
+            lookups.append(asyncio.to_thread(PromptContext.player, player_id))
+        if team_id:
+            lookups.append(asyncio.to_thread(PromptContext.team, team_id))
+        blocks = await asyncio.gather(*lookups, return_exceptions=True)
+        for block in blocks:
+            if isinstance(block, Exception):
+                print(f"Skipping prompt context that could not be looked up: {block}")
+        return [block for block in blocks if block and not isinstance(block, Exception)]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+
+class RaggedColumn:
+    """
+    A column of integer lists stored as one flat ``values`` array plus row ``offsets``.
+
+    Row ``i`` holds ``values[offsets[i]:offsets[i + 1]]``. Unlike an object column of
+    Python lists, both arrays are plain numpy buffers, so they pickle out-of-band into
+    the shared data plane and counting over every element needs no ``explode``.
+    """
+
+    def __init__(self, values, offsets):
+        self.values = np.asarray(values, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def from_series(series: pd.Series) -> "RaggedColumn":
+        """Flattens a Series of lists; missing rows and missing elements are dropped."""
+        exploded = series.reset_index(drop=True).explode()
+        present = exploded.notna().to_numpy()
+        values = exploded[present].astype(np.int64).to_numpy()
+        lengths = np.bincount(exploded.index.to_numpy()[present], minlength=len(series))
+        return RaggedColumn(values, np.concatenate([[0], np.cumsum(lengths)]))
+
+    def is_list_column(series: pd.Series) -> bool:
+        if series.dtype != "object":
+            return False
+        sample = series.dropna().head(100)
+        return len(sample) > 0 and all(isinstance(value, (list, tuple, np.ndarray)) for value in sample)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.offsets.nbytes
+
+    def row(self, position: int) -> np.ndarray:
+        return self.values[self.offsets[position]:self.offsets[position + 1]]
+
+    def value_counts(self) -> pd.Series:
+        """How many times each value occurs across all rows, most frequent first."""
+        return pd.Series(self.values, copy=False).value_counts()
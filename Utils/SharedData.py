@@ -0,0 +1,257 @@
+import argparse
+import json
+import mmap
+import os
+import pickle
+import tempfile
+import threading
+import time
+from multiprocessing import shared_memory
+
+from Utils.Snapshot import DatasetSnapshot, Snapshots
+from Utils.Startup import LazyModule
+
+pd = LazyModule("pandas")
+
+# Directory holding the generation manifest; every worker must point at the same one
+DATA_PLANE_DIR = os.getenv("DATA_PLANE_DIR", os.path.join(tempfile.gettempdir(), "diamond-district-data-plane"))
+MANIFEST_FILE = "manifest.json"
+# Generations whose segment names stay linked, so a worker that just read the manifest can still attach
+KEEP_GENERATIONS = 2
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _with_columns(frame, columns: dict):
+    """``frame`` with ``columns`` replaced, without copying any of its other columns."""
+    data = {name: columns.get(name, frame[name]) for name in frame.columns}
+    rebuilt = pd.DataFrame(data, index=frame.index, copy=False)
+    rebuilt.attrs = dict(frame.attrs)
+    return rebuilt
+
+
+def _split_datetimes(value):
+    """
+    Swaps the naive datetime64 columns of a DataFrame for their int64 view.
+
+    pandas pickles datetime arrays in-band, so without this every worker would get its
+    own copy of them. Returns the frame to pickle and the dtypes to restore on attach.
+    """
+    if not isinstance(value, pd.DataFrame):
+        return value, {}
+    dtypes = {name: str(dtype) for name, dtype in value.dtypes.items() if pd.api.types.is_datetime64_dtype(dtype)}
+    if not dtypes:
+        return value, {}
+    views = {name: pd.Series(value[name].to_numpy().view("int64"), index=value.index, copy=False) for name in dtypes}
+    return _with_columns(value, views), dtypes
+
+
+def _restore_datetimes(frame, dtypes: dict):
+    if not dtypes:
+        return frame
+    views = {name: pd.Series(frame[name].to_numpy().view(dtype), index=frame.index, copy=False)
+             for name, dtype in dtypes.items()}
+    return _with_columns(frame, views)
+
+
+class SharedGeneration:
+    """
+    One published generation of the datasets, attached read-only.
+
+    The DataFrames and sketches hold numpy arrays that point straight into the shared
+    memory mapping; the mapping is released once nothing references them any more.
+    """
+
+    def __init__(self, generation: int, datasets: dict):
+        self.generation = generation
+        self.datasets = datasets
+
+
+class SharedDataPlane:
+    """
+    Publishes the loaded datasets into ``multiprocessing.shared_memory`` once, for every
+    uvicorn worker to attach read-only.
+
+    Each dataset is pickled with protocol 5 so that its numpy buffers (numeric columns,
+    categorical codes, sketch tables) are written out-of-band into one segment per
+    generation. Attaching rebuilds the objects on top of that segment without copying
+    those buffers, so memory does not grow with the number of workers. Naive datetime64
+    columns are published as their int64 view and rebuilt over the segment on attach,
+    and list columns arrive already flattened into ``RaggedColumn`` arrays by
+    ``DatasetSnapshot.derive``. Only the remaining object columns (uncompacted strings)
+    and timezone-aware datetimes are pickled in-band and copied into each worker.
+
+    A generation becomes visible when its manifest is swapped in with ``os.replace``,
+    which is atomic, so a worker sees either the old or the new generation, never a mix.
+    """
+
+    def manifest_path(directory: str = DATA_PLANE_DIR) -> str:
+        return os.path.join(directory, MANIFEST_FILE)
+
+    def read_manifest(directory: str = DATA_PLANE_DIR):
+        try:
+            with open(SharedDataPlane.manifest_path(directory)) as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return None
+
+    def publish(datasets: dict, directory: str = DATA_PLANE_DIR) -> int:
+        """
+        Writes ``datasets`` into a new shared memory generation and makes it current.
+
+        Returns:
+            The generation number that was published.
+        """
+        os.makedirs(directory, exist_ok=True)
+        previous = SharedDataPlane.read_manifest(directory)
+        generation = previous["generation"] + 1 if previous else 1
+
+        payloads, datetime_columns = {}, {}
+        for name, value in datasets.items():
+            buffers = []
+            value, datetime_columns[name] = _split_datetimes(value)
+            data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+            payloads[name] = (data, [buffer.raw() for buffer in buffers])
+
+        entries, offset = {}, 0
+        for name, (data, buffers) in payloads.items():
+            entry = {"offset": offset, "size": len(data), "buffers": [], "datetime_columns": datetime_columns[name]}
+            offset = _align(offset + len(data))
+            for buffer in buffers:
+                entry["buffers"].append([offset, buffer.nbytes])
+                offset = _align(offset + buffer.nbytes)
+            entries[name] = entry
+
+        segment_name = f"diamond_district_{os.getpid()}_{generation}"
+        segment = shared_memory.SharedMemory(name=segment_name, create=True, size=max(offset, 1))
+        for name, (data, buffers) in payloads.items():
+            entry = entries[name]
+            segment.buf[entry["offset"]:entry["offset"] + entry["size"]] = data
+            for buffer, (buffer_offset, size) in zip(buffers, entry["buffers"]):
+                segment.buf[buffer_offset:buffer_offset + size] = buffer
+        segment.close()
+
+        manifest = {
+            "generation": generation,
+            "segment": segment_name,
+            "published_at": time.time(),
+            "datasets": entries,
+            "history": ([segment_name] + (previous or {}).get("history", []))[:KEEP_GENERATIONS],
+        }
+        tmp_path = SharedDataPlane.manifest_path(directory) + ".tmp"
+        with open(tmp_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(tmp_path, SharedDataPlane.manifest_path(directory))
+
+        # Unlinking only removes the name; workers that already attached keep their mapping
+        for stale in (previous or {}).get("history", [])[KEEP_GENERATIONS - 1:]:
+            SharedDataPlane._unlink(stale)
+        return generation
+
+    def attach(directory: str = DATA_PLANE_DIR, retries: int = 3) -> SharedGeneration:
+        """Attaches read-only to the current generation, or returns None if none is published yet."""
+        for _ in range(retries):
+            manifest = SharedDataPlane.read_manifest(directory)
+            if manifest is None:
+                return None
+            try:
+                view = memoryview(SharedDataPlane._map_readonly(manifest["segment"]))
+            except FileNotFoundError:
+                # Superseded and unlinked between reading the manifest and opening it
+                continue
+            datasets = {}
+            for name, entry in manifest["datasets"].items():
+                data = view[entry["offset"]:entry["offset"] + entry["size"]]
+                buffers = [view[offset:offset + size] for offset, size in entry["buffers"]]
+                datasets[name] = _restore_datetimes(pickle.loads(data, buffers=buffers), entry.get("datetime_columns"))
+            return SharedGeneration(manifest["generation"], datasets)
+        raise RuntimeError("Could not attach to the shared data plane")
+
+    def _map_readonly(segment_name: str) -> mmap.mmap:
+        # SharedMemory always maps read-write and registers the segment with the worker's
+        # resource tracker, which would unlink it when the worker exits. Map it PROT_READ
+        # directly instead; only the publisher owns the segment's lifetime.
+        # Private CPython module, POSIX only: imported here so the app never needs it
+        # unless DATA_PLANE=shared.
+        import _posixshmem
+
+        fd = _posixshmem.shm_open("/" + segment_name, os.O_RDONLY, mode=0o600)
+        try:
+            return mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+
+    def _unlink(segment_name: str):
+        try:
+            segment = shared_memory.SharedMemory(name=segment_name)
+        except FileNotFoundError:
+            return
+        segment.close()
+        segment.unlink()
+
+
+class SharedDataWatcher:
+    """Keeps a worker attached to the latest published generation."""
+
+    current = None
+
+    def apply(generation: SharedGeneration):
+        Snapshots.publish(generation.datasets, version=generation.generation)
+        SharedDataWatcher.current = generation
+        print(f"Attached to shared data generation {generation.generation}")
+
+    def refresh(directory: str = DATA_PLANE_DIR) -> bool:
+        manifest = SharedDataPlane.read_manifest(directory)
+        current = SharedDataWatcher.current
+        if manifest is None or (current is not None and manifest["generation"] == current.generation):
+            return False
+        generation = SharedDataPlane.attach(directory)
+        if generation is None:
+            return False
+        SharedDataWatcher.apply(generation)
+        return True
+
+    def start(poll_seconds: float = 5.0, directory: str = DATA_PLANE_DIR):
+        """Attaches now (waiting for the loader if needed) and polls for new generations."""
+        while not SharedDataWatcher.refresh(directory) and SharedDataWatcher.current is None:
+            print("Waiting for the data loader to publish a generation...")
+            time.sleep(poll_seconds)
+
+        def poll():
+            while True:
+                time.sleep(poll_seconds)
+                try:
+                    SharedDataWatcher.refresh(directory)
+                except Exception as e:
+                    print(f"Failed to refresh shared data: {e}")
+
+        threading.Thread(target=poll, name="shared-data-watcher", daemon=True).start()
+
+
+if __name__ == "__main__":
+    from Utils.DataLoader import DataLoader
+
+    parser = argparse.ArgumentParser(description="Load the datasets once and publish them to the uvicorn workers.")
+    parser.add_argument("--reload-seconds", type=float, default=0, help="Reload and publish a new generation at this interval (0 publishes once).")
+    parser.add_argument("--directory", default=DATA_PLANE_DIR)
+    args = parser.parse_args()
+
+    try:
+        while True:
+            datasets = DatasetSnapshot.derive(DataLoader.load_datasets())
+            generation = SharedDataPlane.publish(datasets, args.directory)
+            print(f"Published shared data generation {generation}")
+            if not args.reload_seconds:
+                # The segments live until unlinked; stay up so the data plane has an owner
+                print("Publisher idle; press Ctrl+C to unlink the data plane and exit.")
+                while True:
+                    time.sleep(3600)
+            time.sleep(args.reload_seconds)
+    except KeyboardInterrupt:
+        manifest = SharedDataPlane.read_manifest(args.directory) or {}
+        for segment_name in manifest.get("history", []):
+            SharedDataPlane._unlink(segment_name)
+        os.remove(SharedDataPlane.manifest_path(args.directory))
@@ -0,0 +1,273 @@
+import hashlib
+import math
+from datetime import datetime, date
+
+import numpy as np
+import pandas as pd
+
+
+def stable_hash(key) -> int:
+    """
+    Deterministic 64-bit hash of a key.
+
+    Python's built-in ``hash`` is salted per process, so sketches built in different
+    worker processes would not line up. blake2b gives the same value everywhere, which
+    is what makes the sketches below mergeable across workers.
+    """
+    return int.from_bytes(hashlib.blake2b(str(key).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch for approximate per-key counts.
+
+    Estimates never undercount; they overcount by at most ``epsilon * total`` with
+    probability ``confidence``.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 5):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _indexes(self, key):
+        h = stable_hash(key)
+        h1, h2 = h & 0xFFFFFFFF, h >> 32
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def update(self, key, count: int = 1):
+        self.table[np.arange(self.depth), self._indexes(key)] += count
+        self.total += count
+
+    def estimate(self, key) -> int:
+        return int(self.table[np.arange(self.depth), self._indexes(key)].min())
+
+    def merge(self, other: "CountMinSketch"):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different dimensions")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def confidence(self) -> float:
+        return 1 - math.exp(-self.depth)
+
+    def error_bound(self) -> int:
+        return math.ceil(self.epsilon * self.total)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter summary holding at most ``capacity`` keys.
+
+    Each tracked key keeps ``[count, error]`` where ``count - error <= true count <= count``.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.counters = {}
+
+    def _min_count(self) -> int:
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def update(self, key, count: int = 1):
+        if key in self.counters:
+            self.counters[key][0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[key] = [count, 0]
+        else:
+            victim = min(self.counters, key=lambda k: self.counters[k][0])
+            floor = self.counters.pop(victim)[0]
+            self.counters[key] = [floor + count, floor]
+
+    def update_many(self, counts: pd.Series):
+        """Add exact per-key counts, e.g. the ``value_counts`` of one shard."""
+        if not self.counters:
+            # keys past the top ``capacity`` are never larger than the smallest kept count
+            self.counters = {key: [int(count), 0] for key, count in counts.nlargest(self.capacity).items()}
+            return
+        for key, count in counts.items():
+            self.update(key, int(count))
+
+    def merge(self, other: "SpaceSaving"):
+        """Merge another summary in (Agarwal et al. mergeable summaries)."""
+        self_floor, other_floor = self._min_count(), other._min_count()
+        merged = {}
+        for key in self.counters.keys() | other.counters.keys():
+            count_a, error_a = self.counters.get(key, (self_floor, self_floor))
+            count_b, error_b = other.counters.get(key, (other_floor, other_floor))
+            merged[key] = [count_a + count_b, error_a + error_b]
+        top = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:self.capacity]
+        self.counters = dict(top)
+        return self
+
+    def top(self, k: int):
+        return sorted(self.counters.items(), key=lambda item: item[1][0], reverse=True)[:k]
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with ``2 ** precision`` registers."""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_many(self, keys):
+        hashes = np.fromiter((stable_hash(k) for k in keys), dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        shift = np.uint64(64 - self.precision)
+        idx = (hashes >> shift).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        # position of the leftmost set bit within the remaining (64 - p) bits
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = ((64 - self.precision) - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.registers.size)
+
+
+class DaySketch:
+    """Sketches for a single day bucket of interactions."""
+
+    def __init__(self, cms_width=2048, cms_depth=5, heavy_hitters=256, hll_precision=12):
+        self.counts = CountMinSketch(cms_width, cms_depth)
+        self.heavy_hitters = SpaceSaving(heavy_hitters)
+        self.fans = HyperLogLog(hll_precision)
+
+    def merge(self, other: "DaySketch"):
+        self.counts.merge(other.counts)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.fans.merge(other.fans)
+        return self
+
+
+class InteractionSketches:
+    """
+    Per-day heavy-hitter and distinct-fan sketches over the fan content interaction data.
+
+    Memory is bounded by the number of day buckets, not by the number of interactions,
+    so ingesting further shards through ``add_frame`` keeps query latency flat. Buckets
+    built in different processes can be combined with ``merge``.
+    """
+
+    content_key = "slug"
+    fan_key = "user_id"
+
+    def __init__(self, **sketch_args):
+        self.sketch_args = sketch_args
+        self.days = {}
+        # slug -> (content_type, content_headline), used to decode the top-k keys
+        self.content_lookup = {}
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, **sketch_args):
+        sketches = cls(**sketch_args)
+        sketches.add_frame(df)
+        return sketches
+
+    def add_frame(self, df: pd.DataFrame):
+        """Ingest a shard of interaction rows into the day buckets."""
+        days = pd.to_datetime(df["date_time_date"]).dt.date
+        if {"content_type", "content_headline"}.issubset(df.columns):
+            firsts = df.drop_duplicates(self.content_key)
+            for slug, content_type, headline in zip(firsts[self.content_key], firsts["content_type"], firsts["content_headline"]):
+                self.content_lookup.setdefault(slug, (content_type, headline))
+
+        for day, group in df.groupby(days, sort=False):
+            bucket = self.days.setdefault(day, DaySketch(**self.sketch_args))
+            counts = group[self.content_key].value_counts()
+            # categorical columns also report every unobserved category with a zero count
+            counts = counts[counts > 0]
+            for slug, count in counts.items():
+                bucket.counts.update(slug, int(count))
+            bucket.heavy_hitters.update_many(counts)
+            if self.fan_key in group:
+                bucket.fans.add_many(group[self.fan_key].dropna().unique())
+        return self
+
+    def merge(self, other: "InteractionSketches"):
+        """Merge sketches built elsewhere (another shard or worker) into this one."""
+        for day, bucket in other.days.items():
+            if day in self.days:
+                self.days[day].merge(bucket)
+            else:
+                merged = DaySketch(**self.sketch_args)
+                self.days[day] = merged.merge(bucket)
+        for slug, content in other.content_lookup.items():
+            self.content_lookup.setdefault(slug, content)
+        return self
+
+    def range_sketch(self, from_date, to_date) -> DaySketch:
+        """Merge all day buckets inside ``[from_date, to_date]`` into one sketch."""
+        from_day = from_date.date() if isinstance(from_date, datetime) else from_date
+        to_day = to_date.date() if isinstance(to_date, datetime) else to_date
+        merged = DaySketch(**self.sketch_args)
+        for day, bucket in self.days.items():
+            if from_day <= day <= to_day:
+                merged.merge(bucket)
+        return merged
+
+    def top_content(self, from_date: date, to_date: date, k: int = 10):
+        """
+        Approximate top-k content and unique fans within a date range.
+
+        Returns:
+            A dict with the top-k ``results`` and the ``error_bounds`` that apply to them.
+        """
+        sketch = self.range_sketch(from_date, to_date)
+        cms_bound = sketch.counts.error_bound()
+        # Rank every tracked candidate by the count it reports, the tighter of the
+        # Space-Saving upper bound and the Count-Min estimate, then keep the top k
+        candidates = []
+        for slug, (count, error) in sketch.heavy_hitters.top(sketch.heavy_hitters.capacity):
+            estimate = min(count, sketch.counts.estimate(slug))
+            candidates.append((estimate, max(count - error, 0), slug))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        results = []
+        for estimate, lower_bound, slug in candidates[:k]:
+            content_type, headline = self.content_lookup.get(slug, (None, None))
+            results.append({
+                "slug": slug,
+                "content_type": content_type,
+                "content_headline": headline,
+                "num_interactions": estimate,
+                "error_bound": max(min(estimate - lower_bound, cms_bound), 0),
+            })
+
+        return {
+            "results": results,
+            "total_interactions": sketch.counts.total,
+            "unique_fans": sketch.fans.count(),
+            "error_bounds": {
+                "num_interactions_max_overcount": cms_bound,
+                "num_interactions_confidence": round(sketch.counts.confidence, 4),
+                "unique_fans_relative_error": round(sketch.fans.relative_error, 4),
+            },
+        }
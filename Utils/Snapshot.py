@@ -0,0 +1,125 @@
+import threading
+import time
+
+from fastapi import HTTPException
+
+from Utils.Startup import LazyModule
+
+pd = LazyModule("pandas")
+
+
+class DatasetSnapshot:
+    """
+    An immutable, versioned view of the loaded datasets and everything derived from them.
+
+    Handlers fetch one snapshot at the start of a request and read only from it, so a
+    reload that happens mid-request can never hand them a mix of old and new data. The
+    frames inside are shared between requests and must be treated as read-only.
+    """
+
+    __slots__ = ("version", "loaded_at", "fan_content_interaction_df", "fan_favourites_df", "fan_follows", "teams",
+                 "players", "interaction_sketches", "player_lookup", "team_lookup")
+    dataset_names = ("fan_content_interaction_df", "fan_favourites_df", "fan_follows", "teams", "players",
+                     "interaction_sketches", "player_lookup", "team_lookup")
+
+    def __init__(self, version: int, datasets: dict):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "loaded_at", time.time())
+        for name in DatasetSnapshot.dataset_names:
+            object.__setattr__(self, name, datasets.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatasetSnapshot is immutable; publish a new snapshot instead")
+
+    def __delattr__(self, name):
+        raise AttributeError("DatasetSnapshot is immutable; publish a new snapshot instead")
+
+    def derive(datasets: dict) -> dict:
+        """
+        Completes the raw datasets with every derived column, index and aggregate.
+
+        Everything a handler needs is computed here, before the snapshot is published,
+        so no request ever has to fix up shared state.
+        """
+        datasets = dict(datasets)
+        interactions = datasets.get("fan_content_interaction_df")
+        if interactions is not None:
+            dates = interactions["date_time_date"]
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                if isinstance(dates.dtype, pd.CategoricalDtype):
+                    # parse each distinct value once; to_datetime may hand categoricals back unchanged
+                    dates = dates.cat.rename_categories(pd.to_datetime(dates.cat.categories)).astype("datetime64[ns]")
+                interactions = interactions.assign(date_time_date=pd.to_datetime(dates))
+                datasets["fan_content_interaction_df"] = interactions
+            if datasets.get("interaction_sketches") is None:
+                from Utils.Sketches import InteractionSketches
+                datasets["interaction_sketches"] = InteractionSketches.from_dataframe(interactions)
+        favourites = datasets.get("fan_favourites_df")
+        if favourites is not None and datasets.get("fan_follows") is None:
+            # list columns become flat id arrays: no per-row Python lists, nothing pickled in-band
+            from Utils.RaggedColumn import RaggedColumn
+            list_columns = [column for column in favourites.columns if RaggedColumn.is_list_column(favourites[column])]
+            datasets["fan_follows"] = {column: RaggedColumn.from_series(favourites[column]) for column in list_columns}
+            datasets["fan_favourites_df"] = favourites.drop(columns=list_columns)
+        for frame_name, lookup_name in (("players", "player_lookup"), ("teams", "team_lookup")):
+            if datasets.get(frame_name) is not None and datasets.get(lookup_name) is None:
+                from Utils.IdLookup import IdLookup
+                datasets[lookup_name] = IdLookup.from_frame(datasets[frame_name])
+        return datasets
+
+
+class Snapshots:
+    """Holds the current DatasetSnapshot and swaps in rebuilt ones atomically."""
+
+    _current = None
+    _version = 0
+    _publish_lock = threading.Lock()
+    _reload_thread = None
+    last_reload_error = None
+
+    def current() -> DatasetSnapshot:
+        # A single attribute read, so it is atomic with respect to publish()
+        snapshot = Snapshots._current
+        if snapshot is None:
+            raise HTTPException(status_code=503, detail="Data is still loading", headers={"Retry-After": "5"})
+        return snapshot
+
+    def is_loaded() -> bool:
+        return Snapshots._current is not None
+
+    def publish(datasets: dict, version: int = None) -> DatasetSnapshot:
+        """Derives everything from ``datasets`` and makes the result the current snapshot."""
+        datasets = DatasetSnapshot.derive(datasets)
+        with Snapshots._publish_lock:
+            Snapshots._version = version if version is not None else Snapshots._version + 1
+            snapshot = DatasetSnapshot(Snapshots._version, datasets)
+            Snapshots._current = snapshot
+        print(f"Published dataset snapshot version {snapshot.version}")
+        return snapshot
+
+    def is_reloading() -> bool:
+        thread = Snapshots._reload_thread
+        return thread is not None and thread.is_alive()
+
+    def reload_in_background(loader) -> bool:
+        """
+        Rebuilds the datasets with ``loader`` on a background thread and publishes them.
+
+        Requests keep being served from the current snapshot until the new one is
+        complete. Returns False if a reload is already running.
+        """
+        with Snapshots._publish_lock:
+            if Snapshots.is_reloading():
+                return False
+
+            def reload():
+                try:
+                    Snapshots.publish(loader())
+                    Snapshots.last_reload_error = None
+                except Exception as e:
+                    Snapshots.last_reload_error = str(e)
+                    print(f"Dataset reload failed, keeping version {Snapshots._version}: {e}")
+
+            Snapshots._reload_thread = threading.Thread(target=reload, name="dataset-reload", daemon=True)
+            Snapshots._reload_thread.start()
+        return True
@@ -0,0 +1,80 @@
+import importlib
+import os
+import sys
+import threading
+import time
+
+# Taken as early as possible: app.py imports this module before anything heavy
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfile:
+    """
+    Records how long each startup phase takes, so import time can be kept under budget.
+
+    Phases are the eager imports in ``app.py``, the startup hook, the background dataset
+    load, and every module that ``LazyModule`` imports on first use.
+    """
+
+    budget_seconds = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "1.5"))
+    phases = []
+    marks = {}
+
+    def record(name: str, seconds: float):
+        StartupProfile.phases.append({"phase": name, "seconds": round(seconds, 4)})
+
+    def mark(name: str):
+        """Records the time since process start at which ``name`` happened."""
+        StartupProfile.marks[name] = round(time.perf_counter() - PROCESS_START, 4)
+
+    class phase:
+        def __init__(self, name: str):
+            self.name = name
+
+        def __enter__(self):
+            self.start = time.perf_counter()
+
+        def __exit__(self, *exc_info):
+            StartupProfile.record(self.name, time.perf_counter() - self.start)
+
+    def report() -> dict:
+        import_seconds = StartupProfile.marks.get("app_imported")
+        return {
+            "import_seconds": import_seconds,
+            "import_budget_seconds": StartupProfile.budget_seconds,
+            "within_budget": import_seconds is not None and import_seconds <= StartupProfile.budget_seconds,
+            "marks": StartupProfile.marks,
+            "phases": sorted(StartupProfile.phases, key=lambda phase: phase["seconds"], reverse=True),
+        }
+
+
+class LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access.
+
+    ``on_load`` runs once right after the import, for one-off setup such as
+    ``genai.configure``. The import time is added to the startup profile.
+    """
+
+    def __init__(self, name: str, on_load=None):
+        self._name = name
+        self._on_load = on_load
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    already_imported = self._name in sys.modules
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    if self._on_load is not None:
+                        self._on_load(module)
+                    if not already_imported:
+                        StartupProfile.record(f"lazy import {self._name}", time.perf_counter() - start)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
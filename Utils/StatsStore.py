@@ -0,0 +1,352 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from fastapi import HTTPException
+
+import config
+from Utils.Utils import Utils
+
+# Next to the code, not the working directory, so the app and the sync CLI share one store
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "stats_store.sqlite3")
+# A scope that fails to refresh is served from the mirror and retried after this long
+STALE_RETRY_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, scope, id)
+);
+CREATE INDEX IF NOT EXISTS records_by_scope ON records (kind, scope, position);
+CREATE INDEX IF NOT EXISTS records_by_id ON records (kind, id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (kind, scope)
+);
+"""
+
+# kind -> (path below the Stats API base URL, key holding the list in the response)
+RESOURCES = {
+    "sports": ("/sports", "sports"),
+    "leagues": ("/league", "leagues"),
+    "seasons": ("/seasons/all", "seasons"),
+    "teams": ("/teams", "teams"),
+    "roster": ("/teams/{team_id}/roster", "roster"),
+    "players": ("/players", "players"),
+    "people": ("/people", "people"),
+}
+
+# Every rostered person lives under this one scope, keyed by id, so roster changes only
+# touch the people who were added or removed
+PEOPLE_SCOPE = "all"
+
+
+def _record_id(kind: str, record: dict, position: int) -> str:
+    if kind == "roster":
+        return str(record.get("person", {}).get("id", position))
+    if kind == "seasons":
+        return str(record.get("seasonId", position))
+    return str(record.get("id", position))
+
+
+class StatsStore:
+    """
+    Local SQLite mirror of the MLB Stats API.
+
+    Every list the League routes and agent tools ask for (sports, leagues, seasons,
+    teams, rosters, players, people) is stored under a ``kind`` and a ``scope`` built
+    from the query parameters, one row per record, indexed by scope and by id. Reads are
+    served from disk; a scope that has never been synced, or was synced more than
+    ``ttl_seconds`` ago, goes upstream and the result is written through so the next
+    read is local. If the upstream is down, any scope already mirrored keeps being
+    served, however old.
+
+    ``path`` and ``ttl_seconds`` default to the STATS_STORE_PATH and
+    STATS_STORE_TTL_SECONDS environment variables, read on first use so ``.env`` applies.
+    """
+
+    _local = threading.local()
+    _retry_at = {}
+    path = None
+    ttl_seconds = None
+    base_url = config.BASE_URL
+
+    def store_path() -> str:
+        return StatsStore.path or os.getenv("STATS_STORE_PATH") or DEFAULT_STORE_PATH
+
+    def ttl() -> float:
+        if StatsStore.ttl_seconds is not None:
+            return StatsStore.ttl_seconds
+        return float(os.getenv("STATS_STORE_TTL_SECONDS", "3600"))
+
+    def connection() -> sqlite3.Connection:
+        path = StatsStore.store_path()
+        connection = getattr(StatsStore._local, "connection", None)
+        if connection is None or getattr(StatsStore._local, "path", None) != path:
+            connection = sqlite3.connect(path, timeout=30)
+            # WAL lets every uvicorn worker read while the sync job writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            StatsStore._local.connection = connection
+            StatsStore._local.path = path
+        return connection
+
+    def scope(**params) -> str:
+        return "&".join(f"{key}={value}" for key, value in sorted(params.items()) if value is not None)
+
+    def params(scope: str) -> dict:
+        """The query parameters a scope was built from; the inverse of ``scope``."""
+        return dict(part.split("=", 1) for part in scope.split("&")) if scope else {}
+
+    def scopes(kind: str = None) -> list:
+        """Every (kind, scope) that has been synced, optionally only of ``kind``."""
+        query, args = "SELECT kind, scope FROM sync_state", ()
+        if kind is not None:
+            query, args = query + " WHERE kind = ?", (kind,)
+        return StatsStore.connection().execute(query + " ORDER BY kind, scope", args).fetchall()
+
+    def drop(kind: str, scope: str):
+        """Removes a scope and its records from the mirror."""
+        connection = StatsStore.connection()
+        with connection:
+            connection.execute("DELETE FROM records WHERE kind = ? AND scope = ?", (kind, scope))
+            connection.execute("DELETE FROM sync_state WHERE kind = ? AND scope = ?", (kind, scope))
+
+    def endpoint(kind: str, **params) -> str:
+        path, _ = RESOURCES[kind]
+        path = path.format(**params)
+        query = StatsStore.scope(**{key: value for key, value in params.items() if "{" + key + "}" not in RESOURCES[kind][0]})
+        return f"{StatsStore.base_url}{path}" + (f"?{query}" if query else "")
+
+    def is_synced(kind: str, scope: str) -> bool:
+        return StatsStore.content_hash(kind, scope) is not None
+
+    def content_hash(kind: str, scope: str) -> str:
+        """Hash of the mirrored content of a scope, or None if it was never synced."""
+        row = StatsStore.connection().execute(
+            "SELECT content_hash FROM sync_state WHERE kind = ? AND scope = ?", (kind, scope)).fetchone()
+        return row[0] if row else None
+
+    def synced_at(kind: str, scope: str) -> float:
+        row = StatsStore.connection().execute(
+            "SELECT synced_at FROM sync_state WHERE kind = ? AND scope = ?", (kind, scope)).fetchone()
+        return row[0] if row else None
+
+    def is_stale(kind: str, scope: str, synced_at: float) -> bool:
+        now = time.time()
+        return now - synced_at > StatsStore.ttl() and now >= StatsStore._retry_at.get((kind, scope), 0)
+
+    def updated_at(kind: str, record_id) -> float:
+        row = StatsStore.connection().execute(
+            "SELECT MAX(updated_at) FROM records WHERE kind = ? AND id = ?", (kind, str(record_id))).fetchone()
+        return row[0]
+
+    def read(kind: str, scope: str) -> list:
+        rows = StatsStore.connection().execute(
+            "SELECT payload FROM records WHERE kind = ? AND scope = ? ORDER BY position", (kind, scope)).fetchall()
+        return [json.loads(payload) for payload, in rows]
+
+    def read_by_id(kind: str, record_id) -> dict:
+        row = StatsStore._latest_by_id(kind, record_id)
+        return json.loads(row[0]) if row else None
+
+    def _latest_by_id(kind: str, record_id):
+        """(payload, scope, synced_at) of the most recently written row for an id, or None."""
+        return StatsStore.connection().execute(
+            "SELECT records.payload, records.scope, sync_state.synced_at FROM records "
+            "JOIN sync_state ON sync_state.kind = records.kind AND sync_state.scope = records.scope "
+            "WHERE records.kind = ? AND records.id = ? ORDER BY records.updated_at DESC LIMIT 1",
+            (kind, str(record_id))).fetchone()
+
+    def write(kind: str, scope: str, records: list) -> bool:
+        """
+        Stores ``records`` as the content of ``kind``/``scope``.
+
+        Only rows whose payload changed are rewritten and rows that disappeared upstream
+        are deleted, so a refresh of an unchanged scope is a single hash comparison.
+
+        Returns:
+            True if anything changed.
+        """
+        serialized = [json.dumps(record, sort_keys=True) for record in records]
+        content_hash = hashlib.sha256("\n".join(serialized).encode("utf-8")).hexdigest()
+        connection = StatsStore.connection()
+        now = time.time()
+        with connection:
+            row = connection.execute(
+                "SELECT content_hash FROM sync_state WHERE kind = ? AND scope = ?", (kind, scope)).fetchone()
+            if row is not None and row[0] == content_hash:
+                connection.execute(
+                    "UPDATE sync_state SET synced_at = ? WHERE kind = ? AND scope = ?", (now, kind, scope))
+                return False
+
+            existing = dict(connection.execute(
+                "SELECT id, payload FROM records WHERE kind = ? AND scope = ?", (kind, scope)).fetchall())
+            seen = set()
+            for position, (record, payload) in enumerate(zip(records, serialized)):
+                record_id = _record_id(kind, record, position)
+                seen.add(record_id)
+                if existing.get(record_id) == payload:
+                    connection.execute(
+                        "UPDATE records SET position = ? WHERE kind = ? AND scope = ? AND id = ?",
+                        (position, kind, scope, record_id))
+                    continue
+                connection.execute(
+                    "INSERT OR REPLACE INTO records (kind, scope, id, position, payload, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (kind, scope, record_id, position, payload, now))
+            connection.executemany(
+                "DELETE FROM records WHERE kind = ? AND scope = ? AND id = ?",
+                [(kind, scope, record_id) for record_id in existing.keys() - seen])
+            connection.execute(
+                "INSERT OR REPLACE INTO sync_state (kind, scope, content_hash, synced_at) VALUES (?, ?, ?, ?)",
+                (kind, scope, content_hash, now))
+        return True
+
+    def fetch(kind: str, **params) -> list:
+        """Fetches one resource from upstream without mirroring it."""
+        _, list_key = RESOURCES[kind]
+        return Utils.fetch_data(StatsStore.endpoint(kind, **params)).get(list_key, [])
+
+    def sync(kind: str, **params) -> list:
+        """Fetches one resource from upstream and mirrors it; returns the records."""
+        records = StatsStore.fetch(kind, **params)
+        StatsStore.write(kind, StatsStore.scope(**params), records)
+        return records
+
+    def refresh(kind: str, **params) -> str:
+        """
+        Makes sure a scope is mirrored and no older than the TTL, and returns it.
+
+        A scope that was never synced has to come from upstream. A stale one is
+        refreshed if upstream answers and served from the mirror otherwise.
+        """
+        scope = StatsStore.scope(**params)
+        synced_at = StatsStore.synced_at(kind, scope)
+        if synced_at is None:
+            StatsStore.sync(kind, **params)
+        elif StatsStore.is_stale(kind, scope, synced_at):
+            try:
+                StatsStore.sync(kind, **params)
+            except HTTPException as e:
+                StatsStore._retry_at[(kind, scope)] = time.time() + STALE_RETRY_SECONDS
+                print(f"Failed to refresh {kind} {scope}, serving the mirrored copy: {e.detail}")
+        return scope
+
+    def get(kind: str, **params) -> list:
+        """Reads a resource from the mirror, going upstream on a miss or once it is stale."""
+        return StatsStore.read(kind, StatsStore.refresh(kind, **params))
+
+    def get_person_payload(person_id) -> str:
+        """
+        One person as the JSON text stored in the mirror, or None if upstream has no such
+        person. Fetched under its own scope on a miss, and refreshed once stale.
+        """
+        row = StatsStore._latest_by_id("people", person_id)
+        if row is None or StatsStore.is_stale("people", row[1], row[2]):
+            try:
+                StatsStore.sync("people", personIds=person_id)
+            except HTTPException as e:
+                if row is None:
+                    raise
+                StatsStore._retry_at[("people", row[1])] = time.time() + STALE_RETRY_SECONDS
+                print(f"Failed to refresh person {person_id}, serving the mirrored copy: {e.detail}")
+            row = StatsStore._latest_by_id("people", person_id)
+        return row[0] if row else None
+
+    def get_person(person_id) -> dict:
+        """Reads one person; see ``get_person_payload``."""
+        payload = StatsStore.get_person_payload(person_id)
+        return json.loads(payload) if payload is not None else None
+
+    def sync_all(sport_id: int = 1, season: int = None) -> dict:
+        """
+        Mirrors sports, leagues, seasons, teams, every team roster, the rostered people
+        and the season's players, then re-syncs every other scope already in the mirror
+        (written through on a miss by a route or tool). Unchanged resources cost one
+        upstream call and no writes.
+
+        Returns:
+            The number of records synced per kind, and the number of other scopes refreshed.
+        """
+        season = season or int(time.strftime("%Y"))
+        synced = set()
+
+        def sync(kind, **params):
+            synced.add((kind, StatsStore.scope(**params)))
+            return StatsStore.sync(kind, **params)
+
+        summary = {
+            "sports": len(sync("sports")),
+            "leagues": len(sync("leagues", sportId=sport_id)),
+            "seasons": len(sync("seasons", sportId=sport_id)),
+        }
+        teams = sync("teams", sportId=sport_id)
+        summary["teams"] = len(teams)
+
+        person_ids, summary["roster"] = set(), 0
+        for team in teams:
+            roster = sync("roster", team_id=team["id"], season=season)
+            summary["roster"] += len(roster)
+            person_ids.update(entry["person"]["id"] for entry in roster if "person" in entry)
+
+        people = []
+        person_ids = sorted(person_ids)
+        for start in range(0, len(person_ids), 100):
+            batch = ",".join(str(person_id) for person_id in person_ids[start:start + 100])
+            people.extend(StatsStore.fetch("people", personIds=batch))
+        # written as one scope: people no longer rostered are deleted, the rest only if changed
+        StatsStore.write("people", PEOPLE_SCOPE, people)
+        summary["people"] = len(people)
+        synced.add(("people", PEOPLE_SCOPE))
+
+        summary["players"] = len(sync("players", season=season))
+
+        summary["refreshed_scopes"] = 0
+        for kind, scope in StatsStore.scopes():
+            if (kind, scope) in synced:
+                continue
+            params = StatsStore.params(scope)
+            person_id = params.get("personIds", "")
+            if kind == "people" and (not person_id.isdigit() or int(person_id) in person_ids):
+                # an old batch scope, or a person fetched on a miss who is rostered now
+                StatsStore.drop(kind, scope)
+                continue
+            try:
+                StatsStore.sync(kind, **params)
+                summary["refreshed_scopes"] += 1
+            except HTTPException as e:
+                print(f"Failed to refresh {kind} {scope}, keeping the mirrored copy: {e.detail}")
+        return summary
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    # Same .env as the app, so both resolve the same store
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Mirror the MLB Stats API into the local SQLite store.")
+    parser.add_argument("--sport-id", type=int, default=1)
+    parser.add_argument("--season", type=int, default=None)
+    parser.add_argument("--every-seconds", type=float, default=0, help="Repeat the delta sync at this interval (0 syncs once).")
+    parser.add_argument("--path", default=None, help="Defaults to STATS_STORE_PATH, then stats_store.sqlite3 next to the code.")
+    parser.add_argument("--base-url", default=config.BASE_URL)
+    args = parser.parse_args()
+
+    StatsStore.path = args.path
+    StatsStore.base_url = args.base_url
+    while True:
+        print(f"Synced {StatsStore.sync_all(args.sport_id, args.season)} into {StatsStore.store_path()}")
+        if not args.every_seconds:
+            break
+        time.sleep(args.every_seconds)
@@ -1,10 +1,12 @@
 import requests
 from fastapi import HTTPException
 from io import BytesIO
-import pandas as pd
 import certifi
 from io import StringIO
 import json
+from Utils.Startup import LazyModule
+
+pd = LazyModule("pandas")
 
 class Utils:
     # Helper function to process API requests
@@ -24,10 +26,44 @@ class Utils:
         except requests.exceptions.RequestException as e:
             raise HTTPException(status_code=500, detail=f"Error fetching image: {e}")
         
-    def load_newline_delimited_json(file_url: str):
+    def load_newline_delimited_json(file_url: str, date_columns=None, compact=True):
         response = requests.get(file_url, verify=False)
         response.raise_for_status()  # Check for HTTP errors
-        return pd.read_json(StringIO(response.text), lines=True)
+        df = pd.read_json(StringIO(response.text), lines=True)
+        for column in date_columns or []:
+            df[column] = pd.to_datetime(df[column])
+        if compact:
+            df = Utils.compact_dataframe(df)
+        return df
+
+    def compact_dataframe(df, max_cardinality_ratio=0.5):
+        """
+        Dictionary-encodes repetitive string columns and downcasts integer columns.
+
+        String columns whose distinct values are at most ``max_cardinality_ratio`` of the
+        rows become categoricals (integer codes plus one lookup table of the distinct
+        strings). Integer and ID columns are downcast to the smallest integer type that
+        holds them. Columns holding lists or mixed objects are left as they are.
+
+        Args:
+            df: The DataFrame to compact.
+            max_cardinality_ratio: Upper bound on distinct values / rows for encoding.
+
+        Returns:
+            The compacted DataFrame. ``df.attrs`` records the deep memory usage in bytes
+            before (``memory_before_bytes``) and after (``memory_after_bytes``) compaction.
+        """
+        memory_before = int(df.memory_usage(deep=True).sum())
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_integer_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+                df[column] = pd.to_numeric(series, downcast="integer")
+            elif series.dtype == "object" and pd.api.types.infer_dtype(series, skipna=True) == "string":
+                if series.nunique() <= max_cardinality_ratio * len(series):
+                    df[column] = series.astype("category")
+        df.attrs["memory_before_bytes"] = memory_before
+        df.attrs["memory_after_bytes"] = int(df.memory_usage(deep=True).sum())
+        return df
     
     def process_endpoint_url(endpoint_url, pop_key=None):
         """
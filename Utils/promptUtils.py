@@ -9,4 +9,5 @@ class PromptsConfig:
                         4) get_leagues_internal : Internal function to fetch all leagues, optionally filtered by sport ID.
                         5) get_seasons_internal : Internal function to fetch all seasons, optionally filtered by sport ID.
                         6) get_teams_internal : Internal function to fetch all teams, optionally filtered by sport ID.
-                        7) get_player_details : Internal function to fetch player details""","default_auto_reply":"TERMINATE","llm_config":{"temperature":0.1,"cache_seed":None},"human_input_mode":"NEVER"}
\ No newline at end of file
+                        7) get_player_details : Internal function to fetch player details
+                        8) resolve_names_internal : Internal function to resolve player and team IDs to names without fetching full lists""","default_auto_reply":"TERMINATE","llm_config":{"temperature":0.1,"cache_seed":None},"human_input_mode":"NEVER"}
\ No newline at end of file
@@ -0,0 +1,43 @@
+import os
+from fastapi import APIRouter,HTTPException
+from fastapi.responses import JSONResponse
+from Utils.DataLoader import DataLoader
+from Utils.Snapshot import Snapshots
+from Utils.Startup import StartupProfile
+from Utils.LoadShedding import LoadShedding
+
+adminRouter=APIRouter(prefix="/admin",tags=["Admin"])
+
+
+@adminRouter.get("/snapshot")
+def get_snapshot_status():
+    """Fetch the version of the dataset snapshot currently being served."""
+    snapshot = Snapshots.current()
+    return {
+        "version": snapshot.version,
+        "loaded_at": snapshot.loaded_at,
+        "reloading": Snapshots.is_reloading(),
+        "last_reload_error": Snapshots.last_reload_error,
+    }
+
+@adminRouter.post("/reload")
+def reload_datasets():
+    """
+    Rebuild the datasets and all derived indexes in the background and swap them in.
+    Requests keep being served from the current snapshot until the new one is ready.
+    """
+    if os.getenv("DATA_PLANE") == "shared":
+        raise HTTPException(status_code=409, detail="Datasets are published by the shared data loader; reload it instead")
+    if not Snapshots.reload_in_background(DataLoader.load_datasets):
+        return JSONResponse(content={"message": "A reload is already in progress"}, status_code=409)
+    return JSONResponse(content={"message": "Reload started"}, status_code=202)
+
+@adminRouter.get("/startup-profile")
+def get_startup_profile():
+    """Report how long the app took to import and start, and which phases dominated."""
+    return StartupProfile.report()
+
+@adminRouter.get("/load")
+def get_load():
+    """Report in-flight and queued requests, sheds and timeouts per route class."""
+    return LoadShedding.gauges()
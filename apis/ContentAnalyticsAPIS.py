@@ -1,71 +1,110 @@
-import pandas as pd
 from fastapi import File, UploadFile,HTTPException,APIRouter
 from Utils.Utils import Utils
-from Utils.Constants import Constants
+from Utils.Startup import LazyModule
+from Utils.Snapshot import Snapshots
 
 from datetime import datetime, timedelta
 from fastapi import Query
 
+# pandas and numpy are only imported once an analytics route is used
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
 contentAPIRouter=APIRouter(tags=["Content Analytics"])
 
 
+def top_k_by_codes(df: "pd.DataFrame", columns: list, k: int = 10) -> "pd.DataFrame":
+    """
+    Count rows per combination of ``columns`` and return the ``k`` most frequent.
+
+    The columns are grouped on their categorical integer codes, packed into a single
+    int64 key, and only the final top-k keys are decoded back to strings. Rows with a
+    missing value in any of the columns are dropped, as ``DataFrame.value_counts`` does.
+    """
+    keys = np.zeros(len(df), dtype=np.int64)
+    valid = np.ones(len(df), dtype=bool)
+    categories = []
+    for column in columns:
+        values = df[column]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        codes = values.cat.codes.to_numpy()
+        valid &= codes >= 0
+        keys = keys * len(values.cat.categories) + codes
+        categories.append(values.cat.categories)
+
+    counts = pd.Series(keys[valid]).value_counts().nlargest(k)
+
+    decoded = {}
+    remaining = counts.index.to_numpy()
+    for column, column_categories in reversed(list(zip(columns, categories))):
+        remaining, codes = np.divmod(remaining, len(column_categories))
+        decoded[column] = column_categories.take(codes)
+    result = pd.DataFrame({column: decoded[column] for column in columns})
+    result["count"] = counts.to_numpy()
+    return result
+
+
+@contentAPIRouter.get("/memory-report")
+def get_memory_report():
+    """Report the memory used by each loaded dataset and what compaction saved."""
+    snapshot = Snapshots.current()
+    report = {"snapshot_version": snapshot.version}
+    for name in ("fan_content_interaction_df", "fan_favourites_df", "teams", "players"):
+        df = getattr(snapshot, name)
+        if df is None:
+            continue
+        current = int(df.memory_usage(deep=True).sum())
+        before = df.attrs.get("memory_before_bytes", current)
+        report[name] = {
+            "rows": len(df),
+            "memory_bytes": current,
+            "memory_before_compaction_bytes": before,
+            "saved_bytes": before - current,
+            "categorical_columns": [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)],
+        }
+    for name, column in (snapshot.fan_follows or {}).items():
+        report.setdefault("fan_follows", {})[name] = {"rows": len(column), "values": len(column.values),
+                                                       "memory_bytes": column.nbytes}
+    return report
+
+
 @contentAPIRouter.get("/most-followed-players-interactions")
 def get_most_followed_players_by_interactions():
     """Fetch most followed players based on interaction data."""
-    if Constants.fan_favourites_df is None:
+    snapshot = Snapshots.current()
+    if not snapshot.fan_follows or "followed_player_ids" not in snapshot.fan_follows:
         raise HTTPException(status_code=400, detail="Data not loaded")
 
-    # Exploding the fan_favourites_df to have one row per interaction
-    fan_interactions_expanded_df = (Constants.fan_favourites_df
-                                     .explode('followed_player_ids')
-                                     .reset_index(drop=True))
-
-    # Convert interaction player IDs to integer format (if needed)
-    fan_interactions_expanded_df['followed_player_ids'] = (
-        fan_interactions_expanded_df['followed_player_ids'].astype('Int64'))
+    # Count every followed player id straight from the flat id array, then keep the top 10
+    player_interactions = (snapshot.fan_follows["followed_player_ids"].value_counts()
+                           .head(10)
+                           .rename_axis("player_id")
+                           .reset_index(name="num_interactions"))
 
-    # Get player interaction counts
-    player_interactions = (pd.merge(
-        fan_interactions_expanded_df['followed_player_ids']
-        .value_counts()
-        .reset_index()
-        .rename(columns={"followed_player_ids": "player_id", "count": "num_interactions"}),
-        Constants.players[['id', 'nameFirstLast']].rename(columns={"id": "player_id", "nameFirstLast": "player_name"}),
-        on='player_id',
-        how='left'
-    )[['player_id', 'player_name', 'num_interactions']])
+    # Resolve the names of just those players with one gather from the snapshot's id lookup
+    player_interactions['player_name'] = snapshot.player_lookup.gather(player_interactions['player_id'], 'nameFirstLast')
 
-    # Return top 10 players by interactions
-    return player_interactions.nlargest(10, 'num_interactions').to_dict(orient="records")
+    return player_interactions[['player_id', 'player_name', 'num_interactions']].to_dict(orient="records")
 
 
 
 @contentAPIRouter.get("/most-followed-teams-interactions")
 def get_most_followed_teams_by_interactions():
     """Fetch most followed teams based on interaction data."""
-    if Constants.fan_favourites_df is None:
+    snapshot = Snapshots.current()
+    if not snapshot.fan_follows or "followed_team_ids" not in snapshot.fan_follows:
         raise HTTPException(status_code=400, detail="Data not loaded")
 
-    # Explode the 'followed_team_ids' column to create 1 row for each followed team
-    team_interactions_expanded_df = (Constants.fan_favourites_df
-                                      .explode('followed_team_ids')
-                                      .reset_index(drop=True))
-
-    # Convert followed team IDs to integer format
-    team_interactions_expanded_df['followed_team_ids'] = team_interactions_expanded_df['followed_team_ids'].astype('Int64')
-
-    # Merge to get team follower counts
-    most_followed_teams = (pd.merge(
-        team_interactions_expanded_df['followed_team_ids'].value_counts().reset_index().
-            rename(columns={"count": "num_followers"}),
-        Constants.teams[['id', 'name']].rename(columns={"id": "team_id", "name": "team_name"}),
-        left_on='followed_team_ids',
-        right_on='team_id',
-        how='left'
-    )[['team_id', 'team_name', 'num_followers']])
-
-    return most_followed_teams.head(10).to_dict(orient="records")
+    # Get team follower counts from the flat id array and resolve the team names with one gather
+    most_followed_teams = (snapshot.fan_follows["followed_team_ids"].value_counts()
+                           .head(10)
+                           .rename_axis("team_id")
+                           .reset_index(name="num_followers"))
+    most_followed_teams['team_name'] = snapshot.team_lookup.gather(most_followed_teams['team_id'], 'name')
+    most_followed_teams = most_followed_teams[['team_id', 'team_name', 'num_followers']]
 
+    return most_followed_teams.to_dict(orient="records")
 
 
 @contentAPIRouter.get("/top-interacted-content")
@@ -77,12 +116,20 @@ def get_top_interacted_content(
     to_date: str = Query(
         default=datetime.now().strftime("%Y-%m-%d"), 
         description="Filter content interactions up to this date (YYYY-MM-DD)"
+    ),
+    approx: bool = Query(
+        default=False,
+        description="Answer from the per-day sketches instead of an exact count, with error bounds"
     )
 ):
     """
     Fetch content pieces with the most fan interactions within a date range.
+    With approx=true the answer comes from mergeable per-day Count-Min/Space-Saving
+    and HyperLogLog sketches, so latency does not grow with the dataset.
     """
-    if Constants.fan_content_interaction_df is None:
+    snapshot = Snapshots.current()
+    interactions = snapshot.fan_content_interaction_df
+    if interactions is None:
         raise HTTPException(status_code=400, detail="Data not loaded")
     
     # Convert dates to datetime objects
@@ -91,29 +138,20 @@ def get_top_interacted_content(
         to_date_obj = datetime.strptime(to_date, "%Y-%m-%d")
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
-    
-    # Ensure the date column is in datetime format
-    if Constants.fan_content_interaction_df["date_time_date"].dtype == "object":
-        Constants.fan_content_interaction_df["date_time_date"] = pd.to_datetime(
-            Constants.fan_content_interaction_df["date_time_date"]
-        )
-    
-    # Filter the data based on the date range
-    filtered_data = Constants.fan_content_interaction_df[
-        (Constants.fan_content_interaction_df["date_time_date"] >= from_date_obj) &
-        (Constants.fan_content_interaction_df["date_time_date"] <= to_date_obj)
+
+    if approx:
+        return snapshot.interaction_sketches.top_content(from_date_obj, to_date_obj, k=10)
+
+    # The date column is parsed to datetime when the snapshot is built
+    filtered_data = interactions[
+        (interactions["date_time_date"] >= from_date_obj) &
+        (interactions["date_time_date"] <= to_date_obj)
     ]
     
     # Find the content pieces with the most interactions
-    content_interactions = (
-        filtered_data[["slug", "content_type", "content_headline"]]
-        .value_counts()
-        .reset_index()
-        .rename(columns={"count": "num_interactions"})
-        .sort_values(by="num_interactions", ascending=False)
-    )
-    
-    return content_interactions.head(10).to_dict(orient="records")
+    content_interactions = top_k_by_codes(filtered_data, ["slug", "content_type", "content_headline"], k=10)
+
+    return content_interactions.rename(columns={"count": "num_interactions"}).to_dict(orient="records")
 
 
 
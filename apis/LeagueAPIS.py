@@ -1,7 +1,9 @@
 from fastapi import APIRouter,HTTPException
 import config
 from Utils.Utils import Utils
-from fastapi.responses import StreamingResponse
+from Utils.StatsStore import StatsStore
+from Utils.DomainModels import Catalogs, Player, Team
+from fastapi.responses import Response, StreamingResponse
 
 LeagueRouter=APIRouter(tags=["League"])
 
@@ -29,34 +31,23 @@ def get_player_headshot(player_id: int):
 @LeagueRouter.get("/sports")
 def get_sports():
     """Fetch all sports."""
-    endpoint = f"{config.BASE_URL}/sports"
-    data = Utils.fetch_data(endpoint)
-    return data.get("sports", [])
+    return StatsStore.get("sports")
 
 @LeagueRouter.get("/leagues")
 def get_leagues(sport_id: int = None):
     """Fetch leagues, optionally filtered by sport ID."""
-    endpoint = f"{config.BASE_URL}/league"
-    if sport_id:
-        endpoint += f"?sportId={sport_id}"
-    data = Utils.fetch_data(endpoint)
-    return data.get("leagues", [])
+    return StatsStore.get("leagues", sportId=sport_id or None)
 
 @LeagueRouter.get("/seasons")
 def get_seasons(sport_id: int = None):
     """Fetch all seasons."""
-    endpoint = f"{config.BASE_SEASON_URL}/all?sportId={sport_id}"
-    data = Utils.fetch_data(endpoint)
-    return data.get("seasons", [])
+    return StatsStore.get("seasons", sportId=sport_id)
 
 @LeagueRouter.get("/teams")
 def get_teams(sport_id: int = None):
     """Fetch teams, optionally filtered by sport ID."""
-    endpoint = f"{config.BASE_URL}/teams"
-    if sport_id:
-        endpoint += f"?sportId={sport_id}"
-    data = Utils.fetch_data(endpoint)
-    return data.get("teams", [])
+    catalog = Catalogs.get("teams", Team, sportId=sport_id or None)
+    return Response(content=catalog.json, media_type="application/json")
 
 @LeagueRouter.get("/team/{team_id}/logo")
 def get_team_logo(team_id: int):
@@ -67,21 +58,20 @@ def get_team_logo(team_id: int):
 @LeagueRouter.get("/team/{team_id}/roster")
 def get_team_roster(team_id: int, season: int):
     """Fetch the roster of a specific team for a given season."""
-    endpoint = f"{config.BASE_URL}/teams/{team_id}/roster?season={season}"
-    data = Utils.fetch_data(endpoint)
-    return data.get("roster", [])
+    return StatsStore.get("roster", team_id=team_id, season=season)
 
 @LeagueRouter.get("/players")
 def get_players(season: int):
     """Fetch all players for a specific season."""
-    endpoint = f"{config.BASE_URL}/players?season={season}"
-    data = Utils.fetch_data(endpoint)
-    return data.get("players", [])
+    catalog = Catalogs.get("players", Player, season=season)
+    return Response(content=catalog.json, media_type="application/json")
 
 
 @LeagueRouter.get("/player/{player_id}")
 def get_player(player_id: int):
     """Fetch a specific player by ID."""
-    endpoint = f"{config.BASE_PLAYER_URL}/{player_id}"
-    data = Utils.fetch_data(endpoint)
-    return data
\ No newline at end of file
+    # The full mirrored person, straight from the JSON text the store already holds
+    payload = StatsStore.get_person_payload(player_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Player {player_id} not found")
+    return Response(content=b'{"people":[' + payload.encode("utf-8") + b']}', media_type="application/json")
\ No newline at end of file
@@ -1,4 +1,3 @@
-import pandas as pd
 from fastapi import File, UploadFile,HTTPException,APIRouter
 from Utils.Utils import Utils
 from Utils.Constants import Constants
@@ -12,12 +11,13 @@ autogenapisrouter=APIRouter(tags=["Question and Extract"])
 
 
 
+# A plain def: the agent chat blocks, so FastAPI runs it on its threadpool, off the event loop
 @autogenapisrouter.post("/answer")
-async def agent(question:str,context:str):
+def agent(question:str,context:str):
     """Ask a question to the AI model."""
     accumulator={}
     agentSetup=Agents(user_proxy_args=PromptsConfig.userProxyArgs,assistant_proxy_args=PromptsConfig.assistantProxyArgs)
-    response=agentSetup.agentChat(tools=[get_team_logo_internal,get_player_headshot_internal,get_sports_internal,get_leagues_internal,get_seasons_internal,get_teams_internal,get_players_internal],question=question,accumulator=accumulator)
+    response=agentSetup.agentChat(tools=[get_team_logo_internal,get_player_headshot_internal,get_sports_internal,get_leagues_internal,get_seasons_internal,get_teams_internal,get_players_internal,resolve_names_internal],question=question,accumulator=accumulator)
     chatHistory=response.chat_history
     cost=response.cost
     chatHistory,response=chatUtils.extract_thought_process(chatHistory)
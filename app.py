@@ -1,55 +1,83 @@
+from Utils.Startup import StartupProfile, LazyModule
 from fastapi import FastAPI, File, UploadFile
 from fastapi.responses import JSONResponse
 from io import BytesIO
 import os
 from dotenv import load_dotenv, dotenv_values 
-import google.generativeai as genai
 from pathlib import Path
 import uvicorn
+import asyncio
+import threading
 import time
 import traceback
 import logging
 from BaseModels import  *
-from apis import LeagueAPIS,ContentAnalyticsAPIS,autogenAPIS
+with StartupProfile.phase("import routers"):
+    from apis import LeagueAPIS,ContentAnalyticsAPIS,autogenAPIS,AdminAPIS
 from Utils.Utils import Utils  
 from Utils.Constants import Constants
-import pandas as pd 
+from Utils.DataLoader import DataLoader
+from Utils.Snapshot import DatasetSnapshot, Snapshots
+from Utils.PromptContext import PromptContext
+from Utils.LoadShedding import LoadShedding, LoadSheddingMiddleware
 from ResponseModels import *
 
 load_dotenv() 
 
-# accessing and printing value
-api_key=os.getenv("API_KEY")
-genai.configure(api_key=api_key)
+# google.generativeai is only imported (and configured) when a Gemini route first uses it
+genai = LazyModule("google.generativeai", on_load=lambda module: module.configure(api_key=os.getenv("API_KEY")))
 app = FastAPI()
+# Per route class concurrency limits, deadlines and fast 503s; gauges at /admin/load
+app.add_middleware(LoadSheddingMiddleware)
 
 
+def load_datasets():
+    with StartupProfile.phase("dataset load"):
+        datasets = DatasetSnapshot.derive(DataLoader.load_datasets())
+    StartupProfile.mark("datasets_ready")
+    return datasets
+
+
+@app.on_event("startup")
+async def size_threadpool():
+    """Give every route class's concurrency limit its threads in the shared pool."""
+    LoadShedding.configure_threadpool()
+
 
 @app.on_event("startup")
 def load_interaction_data():
-    """Load the MLB Fan Content Interaction Data on startup."""
-    mlb_fan_content_interaction_file = 'https://storage.googleapis.com/gcp-mlb-hackathon-2025/datasets/mlb-fan-content-interaction-data/mlb-fan-content-interaction-data-000000000000.json'
-    mlb_fan_favorites_json_file = 'https://storage.googleapis.com/gcp-mlb-hackathon-2025/datasets/mlb-fan-content-interaction-data/2025-mlb-fan-favs-follows.json'
-    teams_endpoint_url = 'https://statsapi.mlb.com/api/v1/teams?sportId=1'
-    single_season_players_url = f'https://statsapi.mlb.com/api/v1/sports/1/players?season={time.strftime("%Y")}'
-
-    Constants.fan_content_interaction_df = Utils.load_newline_delimited_json(mlb_fan_content_interaction_file)
-    Constants.fan_favourites_df=Utils.load_newline_delimited_json(mlb_fan_favorites_json_file)
-    Constants.teams = Utils.process_endpoint_url(teams_endpoint_url,"teams")
-    print(Constants.teams.columns)
-    Constants.players = Utils.process_endpoint_url(single_season_players_url,"people")
-    print(Constants.players.columns)
-    Constants.CONFIG_LIST=eval(os.getenv("CONFIG_LIST"))
-    print(Constants.CONFIG_LIST)
+    """Start loading the MLB Fan Content Interaction Data in the background.
+
+    The server accepts requests straight away; /ready turns 200 once the first snapshot
+    is published, and data routes answer 503 until then. With DATA_PLANE=shared the
+    datasets are attached read-only from the shared memory published by
+    `python -m Utils.SharedData`, instead of being loaded by every worker.
+    """
+    with StartupProfile.phase("startup hook"):
+        if os.getenv("DATA_PLANE") == "shared":
+            # POSIX shared memory is only needed, and only imported, in shared mode
+            from Utils.SharedData import SharedDataWatcher
+            threading.Thread(target=SharedDataWatcher.start, name="shared-data-attach", daemon=True).start()
+        else:
+            Snapshots.reload_in_background(load_datasets)
+    StartupProfile.mark("startup_complete")
     
 app.include_router(LeagueAPIS.LeagueRouter)
 app.include_router(ContentAnalyticsAPIS.contentAPIRouter)
 app.include_router(autogenAPIS.autogenapisrouter)
+app.include_router(AdminAPIS.adminRouter)
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Diamond District"}
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once the datasets are loaded, 503 while they are loading."""
+    if not Snapshots.is_loaded():
+        return JSONResponse(content={"ready": False, "reloading": Snapshots.is_reloading()}, status_code=503, headers={"Retry-After": "5"})
+    return {"ready": True, "snapshot_version": Snapshots.current().version}
+
 
 
 
@@ -69,14 +97,15 @@ async def upload_video(files: List[UploadFile] = File(...)):
                 buffer.write(await file.read())
             
             print(f"Uploading file: {file.filename}")
-            video_file = genai.upload_file(path=file_path)  # Assuming genai is the client for uploading
+            # genai blocks; run it on a worker thread so the event loop keeps serving other routes
+            video_file = await asyncio.to_thread(genai.upload_file, path=file_path)  # Assuming genai is the client for uploading
             
             print(f"Completed upload: {video_file.uri}")
 
             while video_file.state.name == "PROCESSING":
                 print('.', end='')
-                time.sleep(10)
-                video_file = genai.get_file(video_file.name)
+                await asyncio.sleep(10)
+                video_file = await asyncio.to_thread(genai.get_file, video_file.name)
 
             if video_file.state.name == "FAILED":
                 raise ValueError(f"Upload failed for file {file.filename}: {video_file.state.name}")
@@ -104,7 +133,7 @@ async def upload_video(files: List[UploadFile] = File(...)):
     )
 
 @app.delete("/delete/{filename}")
-async def delete_file(filename:str):
+def delete_file(filename:str):
     try:
         genai.delete_file(filename)
         print(f'Deleted file {filename}')
@@ -114,7 +143,7 @@ async def delete_file(filename:str):
         return JSONResponse(content={"message":f"There were issues while deleting the file {filename}"},status_code=221)
     
 @app.post("/extract/clips/")
-async def extract_clips(files:FileNames,model:Model,prompt:str=None):
+def extract_clips(files:FileNames,model:Model,prompt:str=None):
     try:
         files=files.model_dump()['files']
         # Set the model to Gemini 1.5 Pro.
@@ -145,19 +174,18 @@ async def generate_advertisements(files:FileNames,model:Model,prompt:str=None,pl
         files=files.model_dump()['files']
         # Set the model to Gemini 1.5 Pro.
         model=model.model_dump()['model_name']
-        contents=[]
-        if player_id:
-            contents.append()
-        if files:
-            for i in files:
-                contents.append(genai.get_file(i))
+        # Resolve the player/team context and the uploaded files concurrently
+        context_blocks,file_handles=await asyncio.gather(
+            PromptContext.resolve(player_id=player_id,team_id=team_id),
+            asyncio.gather(*[asyncio.to_thread(genai.get_file,i) for i in files or []]))
+        contents=[*context_blocks,*file_handles]
         if prompt:
             contents.append(prompt)
         model = genai.GenerativeModel(model_name=f"models/{model}")
         
         # Make the LLM request.
         print("Making LLM inference request...")
-        response = model.generate_content(contents,
+        response = await asyncio.to_thread(model.generate_content, contents,
                                         request_options={"timeout": 600},generation_config=genai.GenerationConfig(response_mime_type="application/json", response_schema=list[Advertisements]))
         print(response.text)   
 
@@ -170,7 +198,7 @@ async def generate_advertisements(files:FileNames,model:Model,prompt:str=None,pl
     
     
 @app.post("/generate/")
-async def generate_content(files:FileNames,model:Model,prompt:str=None):
+def generate_content(files:FileNames,model:Model,prompt:str=None):
     try:
         files=files.model_dump()['files']
         # Set the model to Gemini 1.5 Pro.
@@ -195,7 +223,7 @@ async def generate_content(files:FileNames,model:Model,prompt:str=None):
         return JSONResponse(content={"message":f"There were issues while generating the response "},status_code=222)
 
 @app.post("/delete/all/")
-async def delete_all():
+def delete_all():
     try:
 
         docs=list(genai.list_files())
@@ -207,7 +235,7 @@ async def delete_all():
         return JSONResponse(content={"message":f"There were some issues while deleting the files"},status_code=223)
     
 @app.get("/files/all")
-async def get_all():
+def get_all():
     try:
 
         docs=list(genai.list_files())
@@ -224,6 +252,7 @@ async def get_all():
 
 
     
+StartupProfile.mark("app_imported")
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=5000)
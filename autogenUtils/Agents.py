@@ -1,20 +1,26 @@
-import autogen
 import datetime
 from Utils.Constants import Constants
+from Utils.Startup import LazyModule
 from autogenUtils.Decorators import simple_decorator_with_args
 
 
+# The autogen stack is only imported when the first agent is created
+autogen = LazyModule("autogen")
+
+
 class Agents:
     def __init__(self,user_proxy_args,assistant_proxy_args) -> None:
         user_proxy_args['is_termination_msg']=lambda x: x.get("content","") and x.get("content")!="" and (x.get("content","").rstrip().endswith("TERMINATE"))
         assistant_proxy_args['is_termination_msg']=lambda x: x.get("content","") and x.get("content")!="" and (x.get("content","").rstrip().endswith("TERMINATE"))
-        assistant_proxy_args['llm_config']['config_list']=Constants.CONFIG_LIST
+        assistant_proxy_args['llm_config']['config_list']=Constants.get_config_list()
         self.userProxy=autogen.UserProxyAgent(**user_proxy_args)
         self.assistantProxy=autogen.AssistantAgent(**assistant_proxy_args)
         
     def agentChat(self,tools,question,accumulator):
+        # Tool results are memoized for this run only, so repeated calls skip the upstream fetch
+        toolCache={}
         for i in tools:
-            i=simple_decorator_with_args(accumulator=accumulator)(i)
+            i=simple_decorator_with_args(accumulator=accumulator,cache=toolCache)(i)
             autogen.agentchat.register_function(
                 i,
                 caller=self.assistantProxy,
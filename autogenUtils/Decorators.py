@@ -1,16 +1,36 @@
+import json
 from functools import wraps
 
 
-def simple_decorator_with_args(accumulator):
+def simple_decorator_with_args(accumulator, cache=None):
+    """
+    Injects the run's accumulator into a tool and, when ``cache`` is given, memoizes the
+    tool's results for the run keyed by (tool name, arguments).
+
+    A repeated call is not executed again; it returns the stored result, so the model
+    gets the same answer without another upstream fetch.
+    """
     
     def simple_decorator(f):
         
         @wraps(f)
         def wrapper(*args, **kwargs):
             kwargs['accumulator'] = accumulator
+            if cache is None:
+                print('Calling decorated function')
+                return f(*args, **kwargs)
+
+            arguments = {key: value for key, value in kwargs.items() if key != 'accumulator'}
+            key = (f.__name__, json.dumps([args, arguments], sort_keys=True, default=str))
+            if key in cache:
+                print(f'Returning memoized result of {f.__name__}')
+                return cache[key]
+
             print('Calling decorated function')
-            return f(*args, **kwargs)
+            result = f(*args, **kwargs)
+            cache[key] = result
+            return result
         
         return wrapper
     
-    return simple_decorator
\ No newline at end of file
+    return simple_decorator
@@ -0,0 +1,205 @@
+import copy
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from Utils.StatsStore import PEOPLE_SCOPE, StatsStore
+
+SEASON = 2024
+
+UPSTREAM = {
+    "sports": [{"id": 1, "name": "Major League Baseball"}],
+    "leagues": [{"id": 103, "name": "American League"}, {"id": 104, "name": "National League"}],
+    "seasons": [{"seasonId": "2024"}],
+    "teams": [{"id": 108, "name": "Los Angeles Angels"}, {"id": 147, "name": "New York Yankees"}],
+    "all_teams": [{"id": 108, "name": "Los Angeles Angels"}, {"id": 147, "name": "New York Yankees"},
+                  {"id": 4124, "name": "Rocket City Trash Pandas"}],
+    "roster": {
+        108: [{"person": {"id": 545361}}],
+        147: [{"person": {"id": 592450}}, {"person": {"id": 543037}}],
+    },
+    "people": {
+        545361: {"id": 545361, "fullName": "Mike Trout"},
+        592450: {"id": 592450, "fullName": "Aaron Judge"},
+        543037: {"id": 543037, "fullName": "Gerrit Cole"},
+        660271: {"id": 660271, "fullName": "Shohei Ohtani"},
+    },
+    "players": [{"id": 545361, "fullName": "Mike Trout"}, {"id": 592450, "fullName": "Aaron Judge"}],
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves a small, mutable slice of the Stats API from ``server.upstream``."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        upstream = self.server.upstream
+        parts = url.path.removeprefix("/api/v1/").split("/")
+
+        if parts == ["sports"]:
+            body = {"sports": upstream["sports"]}
+        elif parts == ["league"]:
+            body = {"leagues": upstream["leagues"]}
+        elif parts == ["seasons", "all"]:
+            body = {"seasons": upstream["seasons"]}
+        elif parts == ["teams"]:
+            body = {"teams": upstream["teams"] if query.get("sportId") == "1" else upstream["all_teams"]}
+        elif parts[0] == "teams" and parts[2:] == ["roster"]:
+            body = {"roster": upstream["roster"].get(int(parts[1]), [])}
+        elif parts == ["people"]:
+            ids = [int(person_id) for person_id in query["personIds"].split(",")]
+            body = {"people": [upstream["people"][person_id] for person_id in ids if person_id in upstream["people"]]}
+        elif parts == ["players"]:
+            body = {"players": upstream["players"]}
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StatsStoreSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self.server.upstream = copy.deepcopy(UPSTREAM)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.saved = (StatsStore.path, StatsStore.base_url, StatsStore.ttl_seconds)
+        StatsStore._retry_at.clear()
+        StatsStore.path = os.path.join(self.directory.name, "stats_store.sqlite3")
+        StatsStore.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v1"
+
+    def tearDown(self):
+        self.stop_server()
+        StatsStore.connection().close()
+        StatsStore._local.connection = None
+        StatsStore.path, StatsStore.base_url, StatsStore.ttl_seconds = self.saved
+        self.directory.cleanup()
+
+    def stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def updated_at(self) -> dict:
+        rows = StatsStore.connection().execute("SELECT kind, scope, id, updated_at FROM records").fetchall()
+        return {(kind, scope, record_id): updated_at for kind, scope, record_id, updated_at in rows}
+
+    def test_first_sync_mirrors_every_resource(self):
+        summary = StatsStore.sync_all(sport_id=1, season=SEASON)
+
+        self.assertEqual(summary, {"sports": 1, "leagues": 2, "seasons": 1, "teams": 2, "roster": 3,
+                                   "people": 3, "players": 2, "refreshed_scopes": 0})
+        self.assertEqual(StatsStore.read("teams", "sportId=1"), UPSTREAM["teams"])
+        self.assertEqual(StatsStore.read("roster", f"season={SEASON}&team_id=147"), UPSTREAM["roster"][147])
+        self.assertEqual([person["id"] for person in StatsStore.read("people", PEOPLE_SCOPE)], [543037, 545361, 592450])
+        self.assertEqual(StatsStore.read_by_id("people", 592450)["fullName"], "Aaron Judge")
+
+    def test_unchanged_resync_writes_no_rows(self):
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+        hashes = {(kind, scope): StatsStore.content_hash(kind, scope) for kind, scope in StatsStore.scopes()}
+        before = self.updated_at()
+
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+
+        self.assertEqual(self.updated_at(), before)
+        self.assertEqual({(kind, scope): StatsStore.content_hash(kind, scope) for kind, scope in StatsStore.scopes()}, hashes)
+
+    def test_changed_row_is_the_only_row_rewritten(self):
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+        before = self.updated_at()
+        self.server.upstream["teams"][1] = {"id": 147, "name": "New York Yankees (renamed)"}
+        self.server.upstream["people"][543037] = {"id": 543037, "fullName": "Gerrit Alan Cole"}
+
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+
+        after = self.updated_at()
+        changed = {key for key in after if after[key] != before.get(key)}
+        self.assertEqual(changed, {("teams", "sportId=1", "147"), ("people", PEOPLE_SCOPE, "543037")})
+        self.assertEqual(StatsStore.read("teams", "sportId=1")[1]["name"], "New York Yankees (renamed)")
+
+    def test_rows_removed_upstream_are_deleted(self):
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+        self.server.upstream["teams"] = self.server.upstream["teams"][:1]
+        self.server.upstream["roster"][108] = []
+
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+
+        self.assertEqual([team["id"] for team in StatsStore.read("teams", "sportId=1")], [108])
+        # Mike Trout left the only roster he was on
+        self.assertIsNone(StatsStore.read_by_id("people", 545361))
+        self.assertEqual(StatsStore.scopes("people"), [("people", PEOPLE_SCOPE)])
+
+    def test_scopes_written_through_on_a_miss_are_refreshed(self):
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+        self.assertEqual(len(StatsStore.get("teams")), 3)
+        self.assertEqual(StatsStore.get_person(660271)["fullName"], "Shohei Ohtani")
+        self.server.upstream["all_teams"].append({"id": 999, "name": "Expansion Team"})
+        self.server.upstream["people"][660271] = {"id": 660271, "fullName": "Shohei Ohtani (updated)"}
+
+        summary = StatsStore.sync_all(sport_id=1, season=SEASON)
+
+        self.assertEqual(summary["refreshed_scopes"], 2)
+        self.assertEqual(len(StatsStore.get("teams")), 4)
+        self.assertEqual(StatsStore.get_person(660271)["fullName"], "Shohei Ohtani (updated)")
+
+    def test_serves_from_the_store_when_upstream_is_down(self):
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+        self.stop_server()
+
+        self.assertEqual(StatsStore.get("teams", sportId=1), UPSTREAM["teams"])
+        self.assertEqual(StatsStore.get("roster", team_id=108, season=SEASON), UPSTREAM["roster"][108])
+        self.assertEqual(StatsStore.get_person(545361)["fullName"], "Mike Trout")
+
+    def test_stale_scopes_are_refreshed_on_read(self):
+        self.assertEqual(StatsStore.get("teams", sportId=1), UPSTREAM["teams"])
+        self.assertEqual(StatsStore.get_person(545361)["fullName"], "Mike Trout")
+        self.server.upstream["teams"] = self.server.upstream["teams"][:1]
+        self.server.upstream["people"][545361] = {"id": 545361, "fullName": "Mike Trout (updated)"}
+
+        # within the TTL the mirror answers
+        self.assertEqual(len(StatsStore.get("teams", sportId=1)), 2)
+        self.assertEqual(StatsStore.get_person(545361)["fullName"], "Mike Trout")
+
+        StatsStore.ttl_seconds = 0
+        self.assertEqual(len(StatsStore.get("teams", sportId=1)), 1)
+        self.assertEqual(StatsStore.get_person(545361)["fullName"], "Mike Trout (updated)")
+
+    def test_stale_scopes_are_served_when_upstream_is_down(self):
+        StatsStore.sync_all(sport_id=1, season=SEASON)
+        StatsStore.ttl_seconds = 0
+        self.stop_server()
+
+        self.assertEqual(StatsStore.get("teams", sportId=1), UPSTREAM["teams"])
+        self.assertEqual(StatsStore.get_person(545361)["fullName"], "Mike Trout")
+
+    def test_path_is_resolved_on_first_use(self):
+        path, test_path = os.path.join(self.directory.name, "from_env.sqlite3"), StatsStore.path
+        StatsStore.path = None
+        os.environ["STATS_STORE_PATH"] = path
+        try:
+            self.assertEqual(StatsStore.store_path(), path)
+            StatsStore.get("sports")
+            self.assertTrue(os.path.exists(path))
+        finally:
+            del os.environ["STATS_STORE_PATH"]
+            StatsStore.path = test_path
+
+
+if __name__ == "__main__":
+    unittest.main()
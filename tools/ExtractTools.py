@@ -3,59 +3,45 @@ import requests
 
 from fastapi import HTTPException
 import config
-from Utils.Utils import Utils
+from Utils.StatsStore import StatsStore
+from Utils.Snapshot import Snapshots
 
 def get_team_logo_internal(team_id: int, accumulator: dict = None):
     """
-    Internal function to fetch the logo of a specific team.
+    Internal function to get the logo URL of a specific team.
     
     Args:
-        team_id (int): The ID of the team whose logo is to be fetched.
+        team_id (int): The ID of the team whose logo is requested.
         accumulator (dict, optional): A dictionary to accumulate data or logs across requests.
         
     Returns:
-        dict: A dictionary containing the logo URL or error information.
+        dict: A dictionary containing the logo URL.
     """
     if accumulator is None:
         accumulator = {}
 
-    try:
-        url = f"{config.BASE_LOGO_URL}/{team_id}.svg"
-        image = Utils.fetch_image(url)
-        
-        # Optionally, accumulate the logo URL for logging or other purposes
-        accumulator["last_fetched_logo"] = image
-        
-        return {"team_id": team_id, "logo_url": url}
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching team logo: {str(e)}")
+    # The URL is deterministic; the client fetches the image itself, so nothing is downloaded here
+    url = f"{config.BASE_LOGO_URL}/{team_id}.svg"
+    accumulator["last_fetched_logo"] = url
+    return {"team_id": team_id, "logo_url": url}
 
 def get_player_headshot_internal(player_id: int, accumulator: dict = None):
     """
-    Internal function to fetch the headshot of a specific player.
+    Internal function to get the headshot URL of a specific player.
     
     Args:
-        player_id (int): The ID of the player whose headshot is to be fetched.
+        player_id (int): The ID of the player whose headshot is requested.
         accumulator (dict, optional): A dictionary to accumulate data or logs across requests.
         
     Returns:
-        dict: A dictionary containing the headshot URL or error information.
+        dict: A dictionary containing the headshot URL.
     """
     if accumulator is None:
         accumulator = {}
 
-    try:
-        url = f"{config.BASE_HEADSHOT_URL}/{player_id}.jpg"
-        image = Utils.fetch_image(url)
-        
-        # Optionally, accumulate the headshot URL for logging or other purposes
-        accumulator["last_fetched_headshot"] = url
-        
-        return {"player_id": player_id, "headshot_url": url}
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching player headshot: {str(e)}")
+    url = f"{config.BASE_HEADSHOT_URL}/{player_id}.jpg"
+    accumulator["last_fetched_headshot"] = url
+    return {"player_id": player_id, "headshot_url": url}
 
 def get_sports_internal(accumulator: dict = None):
     """
@@ -71,13 +57,12 @@ def get_sports_internal(accumulator: dict = None):
         accumulator = {}
 
     try:
-        endpoint = f"{config.BASE_URL}/sports"
-        data = Utils.fetch_data(endpoint)
+        sports = StatsStore.get("sports")
         
-        # Optionally, accumulate sports data for logging or other purposes
-        accumulator["sports_data_fetched"] = data.get("sports", [])
+        # Accumulate a reference to the sports data (route and count), not the records
+        accumulator["sports_data_fetched"] = {"route": "/sports", "count": len(sports)}
         
-        return data.get("sports", [])
+        return sports
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching sports data: {str(e)}")
@@ -97,16 +82,12 @@ def get_leagues_internal(sport_id: int = None, accumulator: dict = None):
         accumulator = {}
 
     try:
-        endpoint = f"{config.BASE_URL}/league"
-        if sport_id:
-            endpoint += f"?sportId={sport_id}"
-        
-        data = Utils.fetch_data(endpoint)
+        leagues = StatsStore.get("leagues", sportId=sport_id or None)
         
-        # Optionally, accumulate leagues data for logging or other purposes
-        accumulator["leagues_data_fetched"] = data.get("leagues", [])
+        # Accumulate a reference to the leagues data (route and count), not the records
+        accumulator["leagues_data_fetched"] = {"route": f"/leagues?sport_id={sport_id}" if sport_id else "/leagues", "count": len(leagues)}
         
-        return data.get("leagues", [])
+        return leagues
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching leagues data: {str(e)}")
@@ -126,13 +107,12 @@ def get_seasons_internal(sport_id: int = None, accumulator: dict = None):
         accumulator = {}
 
     try:
-        endpoint = f"{config.BASE_SEASON_URL}/all?sportId={sport_id}"
-        data = Utils.fetch_data(endpoint)
+        seasons = StatsStore.get("seasons", sportId=sport_id)
         
-        # Optionally, accumulate seasons data for logging or other purposes
-        accumulator["seasons_data_fetched"] = data.get("seasons", [])
+        # Accumulate a reference to the seasons data (route and count), not the records
+        accumulator["seasons_data_fetched"] = {"route": f"/seasons?sport_id={sport_id}", "count": len(seasons)}
         
-        return data.get("seasons", [])
+        return seasons
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching seasons data: {str(e)}")
@@ -152,16 +132,12 @@ def get_teams_internal(sport_id: int = None, accumulator: dict = None):
         accumulator = {}
 
     try:
-        endpoint = f"{config.BASE_URL}/teams"
-        if sport_id:
-            endpoint += f"?sportId={sport_id}"
+        teams = StatsStore.get("teams", sportId=sport_id or None)
         
-        data = Utils.fetch_data(endpoint)
+        # Accumulate a reference to the teams data (route and count), not the records
+        accumulator["teams_data_fetched"] = {"route": f"/teams?sport_id={sport_id}" if sport_id else "/teams", "count": len(teams)}
         
-        # Optionally, accumulate teams data for logging or other purposes
-        accumulator["teams_data_fetched"] = data.get("teams", [])
-        
-        return data.get("teams", [])
+        return teams
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching teams data: {str(e)}")
@@ -182,13 +158,12 @@ def get_team_roster_internal(team_id: int, season: int, accumulator: dict = None
         accumulator = {}
 
     try:
-        endpoint = f"{config.BASE_URL}/teams/{team_id}/roster?season={season}"
-        data = Utils.fetch_data(endpoint)
+        roster = StatsStore.get("roster", team_id=team_id, season=season)
         
-        # Optionally, accumulate roster data for logging or other purposes
-        accumulator["team_roster_data_fetched"] = data.get("roster", [])
+        # Accumulate a reference to the roster data (route and count), not the records
+        accumulator["team_roster_data_fetched"] = {"route": f"/team/{team_id}/roster?season={season}", "count": len(roster)}
         
-        return data.get("roster", [])
+        return roster
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching team roster: {str(e)}")
@@ -208,13 +183,12 @@ def get_players_internal(season: int, accumulator: dict = None):
         accumulator = {}
 
     try:
-        endpoint = f"{config.BASE_URL}/players?season={season}"
-        data = Utils.fetch_data(endpoint)
+        players = StatsStore.get("players", season=season)
         
-        # Optionally, accumulate player data for logging or other purposes
-        accumulator["players_data_fetched"] = data.get("players", [])
+        # Accumulate a reference to the players data (route and count), not the records
+        accumulator["players_data_fetched"] = {"route": f"/players?season={season}", "count": len(players)}
         
-        return data.get("players", [])
+        return players
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching players data: {str(e)}")
@@ -223,6 +197,35 @@ def get_players_internal(season: int, accumulator: dict = None):
 
 def get_player_details(player_id: str,accumulator: dict = None):
     """Fetch a specific player by ID."""
-    endpoint = f"{config.BASE_PLAYER_URL}/{player_id}"
-    data = Utils.fetch_data(endpoint)
-    return data
\ No newline at end of file
+    person = StatsStore.get_person(player_id)
+    return {"people": [person] if person else []}
+
+def resolve_names_internal(player_ids: str = None, team_ids: str = None, accumulator: dict = None):
+    """
+    Internal function to resolve player and team IDs to names without fetching full lists.
+    
+    Args:
+        player_ids (str, optional): Comma separated player IDs to resolve.
+        team_ids (str, optional): Comma separated team IDs to resolve.
+        accumulator (dict, optional): A dictionary to accumulate data or logs across requests.
+        
+    Returns:
+        dict: The player and team names keyed by ID; unknown IDs map to null.
+    """
+    if accumulator is None:
+        accumulator = {}
+
+    try:
+        snapshot = Snapshots.current()
+        names = {}
+        if player_ids:
+            ids = [int(i) for i in str(player_ids).split(",") if i.strip()]
+            names["players"] = dict(zip(map(str, ids), snapshot.player_lookup.gather(ids, "nameFirstLast").tolist()))
+        if team_ids:
+            ids = [int(i) for i in str(team_ids).split(",") if i.strip()]
+            names["teams"] = dict(zip(map(str, ids), snapshot.team_lookup.gather(ids, "name").tolist()))
+        
+        return names
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error resolving names: {str(e)}")